@@ -16,6 +16,8 @@ from datetime import datetime
 import time
 import re
 
+from video_info import probe_video
+
 
 class VideoPipeline:
     def __init__(self, csv_file: str = "playlist.csv", output_dir: str = None, keep_temp: bool = False):
@@ -55,15 +57,38 @@ class VideoPipeline:
         self.config = {
             'conversion': {
                 'codec': 'copy',
-                'quality': 23
+                'quality': 23,
+                'fused': False
             },
             'scene_detection': {
                 'threshold': 5.0,
                 'min_scene_len': 0.5,
                 'detector': 'content',
+                'jobs': 1,
+                'profile': 'full',
+                'backend': 'opencv',
+                'keyframes_only': False,
+                'bisect': False,
+                'sample_interval': 2.0,
+                'two_pass': False,
+                'coarse_stride': 10,
+                'coarse_width': 64,
+                'roi': None,
+                'exclude': [],
+                'hysteresis': 3,
+                'audio_guided': False,
+                'pause_db': -30.0,
                 'extract_frames': True,
                 'frame_type': 'middle',
+                'extraction_mode': 'seek',
+                'dedup_frames': None,
+                'image_format': 'jpg',
+                'frame_quality': None,
+                'max_size': 0,
+                'frame_sizes': None,
+                'stream': False,
                 'extract_clips': False,
+                'clip_mode': 'copy',
                 'generate_html': True,
                 'split_equal': None
             }
@@ -259,6 +284,7 @@ class VideoPipeline:
                     size_mb = output_file.stat().st_size / (1024 * 1024)
                     self._log(f"✅ Conversion successful in {elapsed_time:.1f}s")
                     self._log(f"   File size: {size_mb:.2f} MB")
+                    self._log_video_info(output_file)
                     return True
                 else:
                     self._log(f"❌ File was not created")
@@ -313,10 +339,114 @@ class VideoPipeline:
             sys.executable,
             "scene_detector.py",
             str(video_file),
-            "-o", str(scenes_dir),
+            "-o", str(scenes_dir)
+        ] + self._scene_detector_options(module_dir, transcript)
+        
+        self._log(f"   Video file: {video_file}")
+        self._log_video_info(video_file)
+        self._log(f"   Scenes directory: {scenes_dir}")
+        self._log(f"   Starting scene detector...")
+        
+        return self._run_scene_detector(cmd, scenes_dir)
+    
+    def step_fused_convert_and_detect(self, module: dict) -> bool:
+        """
+        Steps 1 and 2 in one pass: detect scenes while the m3u8 stream downloads
+        
+        scene_detector.py reads the stream directly and tees it in one
+        ffmpeg process. The MP4 is only written when it is kept or needed
+        for frames and clips.
+        
+        :param module: Dictionary with module information
+        :return: Processing success
+        """
+        module_name = module['module']
+        link = module['link']
+        filename = module['filename']
+        transcript = module.get('transcript', '')
+        
+        self._log(f"\n{'='*50}")
+        self._log(f"⚡ FUSED CONVERSION AND SCENE PROCESSING")
+        self._log(f"   Module: {module_name}")
+        self._log(f"   Link: {link[:100]}...")
+        
+        module_dir = self.output_dir / filename
+        module_dir.mkdir(exist_ok=True)
+        video_file = module_dir / f"{filename}.mp4"
+        scenes_dir = module_dir / "scenes"
+        
+        # Check if scenes were already processed
+        if scenes_dir.exists() and any(scenes_dir.iterdir()):
+            self._log(f"✓ Scenes already processed, skipping: {scenes_dir}")
+            return True
+        
+        if self.config['conversion']['codec'] != 'copy':
+            self._log(f"   ⚠️  Fused mode copies streams, codec {self.config['conversion']['codec']} is ignored")
+        
+        # The stream is decoded once at full rate, other detection modes can't apply
+        scene_config = self.config['scene_detection']
+        conflicts = [name for name, value in [("jobs", scene_config.get('jobs', 1) > 1),
+                                              ("backend", scene_config.get('backend', 'opencv') != 'opencv'),
+                                              ("keyframes_only", scene_config.get('keyframes_only')),
+                                              ("bisect", scene_config.get('bisect')),
+                                              ("two_pass", scene_config.get('two_pass')),
+                                              ("audio_guided", scene_config.get('audio_guided'))] if value]
+        if conflicts:
+            self._log(f"❌ Fused mode doesn't support scene detection options: {', '.join(conflicts)}")
+            return False
+        
+        cmd = [
+            sys.executable,
+            "scene_detector.py",
+            link,
+            "-o", str(scenes_dir)
+        ] + self._scene_detector_options(module_dir, transcript)
+        
+        # Frames and clips are cut from the MP4, so it's needed for them too
+        if (self.keep_temp or self.config['scene_detection']['extract_frames']
+                or self.config['scene_detection']['extract_clips']):
+            cmd.extend(["--remux", str(video_file)])
+            self._log(f"   Output file: {video_file}")
+        else:
+            self._log(f"   Output file: not written (detection only)")
+        
+        self._log(f"   Scenes directory: {scenes_dir}")
+        self._log(f"   Starting fused download and scene detection...")
+        
+        return self._run_scene_detector(cmd, scenes_dir)
+    
+    def _log_video_info(self, video_file: Path):
+        """
+        Probe video and log its properties
+        
+        The probe result is cached on disk, so scene_detector.py reuses it
+        instead of opening the video again.
+        
+        :param video_file: Path to video file
+        """
+        try:
+            info = probe_video(str(video_file))
+        except Exception as e:
+            self._log(f"   ⚠️  Failed to probe video: {e}")
+            return
+        
+        self._log(f"   Duration: {info.duration:.1f}s, {info.resolution}, {info.codec}, {info.fps:.2f} fps")
+    
+    def _scene_detector_options(self, module_dir: Path, transcript: str = '') -> list:
+        """
+        Command line options for scene_detector.py from the configuration
+        
+        :param module_dir: Module directory (for the transcript file)
+        :param transcript: Transcript text
+        :return: List of arguments
+        """
+        cmd = [
             "--threshold", str(self.config['scene_detection']['threshold']),
             "--min-scene-len", str(self.config['scene_detection']['min_scene_len']),
-            "--detector", self.config['scene_detection']['detector']
+            "--detector", self.config['scene_detection']['detector'],
+            "--jobs", str(self.config['scene_detection'].get('jobs', 1)),
+            "--profile", self.config['scene_detection'].get('profile', 'full'),
+            "--backend", self.config['scene_detection'].get('backend', 'opencv')
         ]
         
         # Add transcript if available
@@ -328,23 +458,66 @@ class VideoPipeline:
             cmd.extend(["--transcript", str(transcript_file)])
         
         # Add optional parameters
+        if self.config['scene_detection'].get('keyframes_only'):
+            cmd.append("--keyframes-only")
+        
+        if self.config['scene_detection'].get('bisect'):
+            cmd.append("--bisect")
+            cmd.extend(["--sample-interval", str(self.config['scene_detection'].get('sample_interval', 2.0))])
+        
+        if self.config['scene_detection'].get('two_pass'):
+            cmd.append("--two-pass")
+            cmd.extend(["--coarse-stride", str(self.config['scene_detection'].get('coarse_stride', 10))])
+            cmd.extend(["--coarse-width", str(self.config['scene_detection'].get('coarse_width', 64))])
+        
+        if self.config['scene_detection'].get('audio_guided'):
+            cmd.append("--audio-guided")
+            cmd.extend(["--pause-db", str(self.config['scene_detection'].get('pause_db', -30.0))])
+        
+        if self.config['scene_detection']['detector'] == 'slides':
+            if self.config['scene_detection'].get('roi'):
+                cmd.extend(["--roi", self.config['scene_detection']['roi']])
+            for region in self.config['scene_detection'].get('exclude') or []:
+                cmd.extend(["--exclude", region])
+            cmd.extend(["--hysteresis", str(self.config['scene_detection'].get('hysteresis', 3))])
+        
         if self.config['scene_detection'].get('split_equal'):
             cmd.extend(["--split-equal", str(self.config['scene_detection']['split_equal'])])
         
         if self.config['scene_detection']['extract_frames']:
             cmd.append("--extract-frames")
             cmd.extend(["--frame-type", self.config['scene_detection']['frame_type']])
+            cmd.extend(["--extraction-mode", self.config['scene_detection'].get('extraction_mode', 'seek')])
+            if self.config['scene_detection'].get('dedup_frames'):
+                cmd.extend(["--dedup-frames", self.config['scene_detection']['dedup_frames']])
+            cmd.extend(["--image-format", self.config['scene_detection'].get('image_format', 'jpg')])
+            if self.config['scene_detection'].get('frame_quality'):
+                cmd.extend(["--quality", str(self.config['scene_detection']['frame_quality'])])
+            if self.config['scene_detection'].get('max_size'):
+                cmd.extend(["--max-size", str(self.config['scene_detection']['max_size'])])
+            if self.config['scene_detection'].get('frame_sizes'):
+                cmd.extend(["--frame-sizes", self.config['scene_detection']['frame_sizes']])
         
         if self.config['scene_detection']['extract_clips']:
             cmd.append("--extract-clips")
+            cmd.extend(["--clip-mode", self.config['scene_detection'].get('clip_mode', 'copy')])
+        
+        if self.config['scene_detection'].get('stream'):
+            cmd.append("--stream")
         
         if self.config['scene_detection']['generate_html']:
             cmd.append("--html")
         
-        self._log(f"   Video file: {video_file}")
-        self._log(f"   Scenes directory: {scenes_dir}")
-        self._log(f"   Starting scene detector...")
+        return cmd
+    
+    def _run_scene_detector(self, cmd: list, scenes_dir: Path) -> bool:
+        """
+        Run scene_detector.py and log its output
         
+        :param cmd: Command to run
+        :param scenes_dir: Scenes directory for checking results
+        :return: Scene processing success
+        """
         try:
             # Start detector
             start_time = time.time()
@@ -403,11 +576,13 @@ class VideoPipeline:
         clips_dir = scenes_dir / "clips"
         
         if frames_dir.exists():
-            frame_count = len(list(frames_dir.glob("*.jpg")))
+            # Renditions of a frame in frames/<size>/ share its file name
+            frame_count = len({path.name for path in frames_dir.rglob("*") if path.suffix in ('.jpg', '.webp', '.png')})
             self._log(f"   Extracted frames: {frame_count}")
         
         if clips_dir.exists():
-            clip_count = len(list(clips_dir.glob("*.mp4")))
+            # --clip-mode hls writes a playlist per scene instead of a clip file
+            clip_count = len(list(clips_dir.glob("scene_*.mp4"))) + len(list(clips_dir.glob("scene_*.m3u8")))
             self._log(f"   Extracted clips: {clip_count}")
         
         # Check HTML report
@@ -428,6 +603,17 @@ class VideoPipeline:
         self._log(f"📦 PROCESSING MODULE: {module_name}")
         self._log(f"{'='*60}")
         
+        if self.config['conversion'].get('fused'):
+            # Steps 1 and 2 together from the stream
+            if not self.step_fused_convert_and_detect(module):
+                self._log(f"❌ Error at fused conversion and scene processing step")
+                self.failed_modules.append(module_name)
+                return False
+            
+            self._log(f"✅ Module successfully processed")
+            self.processed_modules += 1
+            return True
+        
         # Step 1: Conversion
         if not self.step1_convert_module(module):
             self._log(f"❌ Error at conversion step")
@@ -498,6 +684,29 @@ class VideoPipeline:
         
         self._log(f"\n📋 Report saved: {report_file}")
     
+    def check_dependencies(self) -> bool:
+        """
+        Check scene detector dependencies once before processing modules
+        
+        scene_detector.py --check reads package metadata only, so this
+        doesn't import OpenCV.
+        
+        :return: True if all required dependencies are installed
+        """
+        result = subprocess.run(
+            [sys.executable, "scene_detector.py", "--check"],
+            capture_output=True,
+            text=True
+        )
+        
+        if result.returncode != 0:
+            self._log("❌ Scene detector dependencies are missing:")
+            for line in result.stdout.strip().split('\n'):
+                self._log(f"   {line}")
+            return False
+        
+        return True
+    
     def update_config(self, config_dict: dict):
         """Update configuration"""
         for key, value in config_dict.items():
@@ -515,6 +724,9 @@ class VideoPipeline:
         """
         self._log("\n🚀 STARTING PIPELINE")
         
+        if not self.check_dependencies():
+            return False
+        
         # Read CSV
         modules = self.read_csv()
         
@@ -669,6 +881,14 @@ Usage examples:
         help="Video quality when re-encoding (0-51, default: 23)"
     )
     
+    parser.add_argument(
+        "--fused",
+        action="store_true",
+        help="Detect scenes while downloading, without a separate conversion step "
+             "(MP4 is written only with --keep-temp, frame or clip extraction; "
+             "not with --jobs, --backend ffmpeg-pipe, --keyframes-only, --bisect, --two-pass or --audio-guided)"
+    )
+    
     # Scene detection parameters
     parser.add_argument(
         "--threshold",
@@ -686,9 +906,109 @@ Usage examples:
     
     parser.add_argument(
         "--detector",
-        choices=['content', 'adaptive'],
+        choices=['content', 'adaptive', 'numpy', 'ffmpeg-scene', 'slides'],
         default='content',
-        help="Scene detector type (default: content)"
+        help="Scene detector type (default: content, 'numpy' - batched content detector, "
+             "'ffmpeg-scene' - ffmpeg scene score)"
+    )
+    
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        metavar="N",
+        help="Parallel processes for scene detection of one video (default: 1)"
+    )
+    
+    parser.add_argument(
+        "--profile",
+        choices=['full', 'fast'],
+        default='full',
+        help="Scene detection profile (default: full, 'fast' analyses downscaled frames with a stride)"
+    )
+    
+    parser.add_argument(
+        "--backend",
+        choices=['opencv', 'ffmpeg-pipe'],
+        default='opencv',
+        help="Frame decoding backend for scene detection (default: opencv)"
+    )
+    
+    parser.add_argument(
+        "--keyframes-only",
+        action="store_true",
+        help="Compare only keyframes during scene detection (fast triage)"
+    )
+    
+    parser.add_argument(
+        "--bisect",
+        action="store_true",
+        help="Compare keyframes (or sparse samples) and search only differing GOPs for exact cuts "
+             "(for static lecture videos)"
+    )
+    
+    parser.add_argument(
+        "--sample-interval",
+        type=float,
+        default=2.0,
+        metavar="SECONDS",
+        help="Seconds between samples in bisect mode when keyframes are too dense to sample (default: 2)"
+    )
+    
+    parser.add_argument(
+        "--two-pass",
+        action="store_true",
+        help="Coarse low-resolution pass, then frame-accurate pass over candidate windows"
+    )
+    
+    parser.add_argument(
+        "--coarse-stride",
+        type=int,
+        default=10,
+        metavar="N",
+        help="Analyse every Nth frame in the coarse pass (default: 10)"
+    )
+    
+    parser.add_argument(
+        "--coarse-width",
+        type=int,
+        default=64,
+        metavar="PX",
+        help="Frame width for the coarse pass (default: 64)"
+    )
+    
+    parser.add_argument(
+        "--roi",
+        metavar="X,Y,W,H",
+        help="Region analysed by the slides detector, in pixels (default: full frame)"
+    )
+    
+    parser.add_argument(
+        "--exclude",
+        action="append",
+        metavar="X,Y,W,H",
+        help="Region ignored by the slides detector, e.g. a webcam overlay (repeatable)"
+    )
+    
+    parser.add_argument(
+        "--hysteresis",
+        type=int,
+        default=3,
+        metavar="K",
+        help="Frames a slide change must persist before a cut (default: 3)"
+    )
+    
+    parser.add_argument(
+        "--audio-guided",
+        action="store_true",
+        help="Decode video only around pauses in the audio track (lectures)"
+    )
+    
+    parser.add_argument(
+        "--pause-db",
+        type=float,
+        default=-30.0,
+        help="Audio level counted as a pause, in dB below speech (default: -30)"
     )
     
     parser.add_argument(
@@ -720,12 +1040,64 @@ Usage examples:
         help="Frame type for extraction (default: middle)"
     )
     
+    parser.add_argument(
+        "--extraction-mode",
+        choices=['seek', 'sequential'],
+        default='seek',
+        help="Frame extraction mode (default: seek, 'sequential' is faster for many scenes)"
+    )
+    
+    parser.add_argument(
+        "--dedup-frames",
+        choices=["mark", "skip"],
+        help="Mark near duplicate frames in metadata or skip writing them"
+    )
+    
+    parser.add_argument(
+        "--image-format",
+        choices=["jpg", "webp", "png"],
+        default="jpg",
+        help="Image format of extracted frames (default: jpg)"
+    )
+    
+    parser.add_argument(
+        "--frame-quality",
+        type=int,
+        help="JPEG/WebP quality of extracted frames (1-100)"
+    )
+    
+    parser.add_argument(
+        "--max-size",
+        type=int,
+        default=0,
+        help="Longest side of extracted frames in pixels (default: full size)"
+    )
+    
+    parser.add_argument(
+        "--frame-sizes",
+        help="Save frames in several sizes from one decode, e.g. 256,1024,full (into frames/<size>/)"
+    )
+    
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Extract frames and clips while scene detection is still running"
+    )
+    
     parser.add_argument(
         "--extract-clips",
         action="store_true",
         help="Extract video clips for each scene"
     )
     
+    parser.add_argument(
+        "--clip-mode",
+        choices=["copy", "smart", "reencode", "hls"],
+        default="copy",
+        help="Clip cutting mode (smart = frame-accurate, re-encodes only clip edges, "
+             "hls = per-scene playlists, no clip files)"
+    )
+    
     parser.add_argument(
         "--no-html",
         dest="generate_html",
@@ -742,6 +1114,17 @@ Usage examples:
     
     args = parser.parse_args()
     
+    # Scene streaming runs one pass over every frame, these modes don't
+    if args.stream and not args.split_equal:
+        conflicts = [name for name, value in [("--jobs", args.jobs > 1),
+                                              ("--backend", args.backend != 'opencv'),
+                                              ("--keyframes-only", args.keyframes_only),
+                                              ("--bisect", args.bisect),
+                                              ("--two-pass", args.two_pass),
+                                              ("--audio-guided", args.audio_guided)] if value]
+        if conflicts:
+            parser.error(f"--stream can't be combined with {', '.join(conflicts)}")
+    
     try:
         # Create pipeline
         pipeline = VideoPipeline(
@@ -754,15 +1137,38 @@ Usage examples:
         config = {
             'conversion': {
                 'codec': args.codec,
-                'quality': args.quality
+                'quality': args.quality,
+                'fused': args.fused
             },
             'scene_detection': {
                 'threshold': args.threshold,
                 'min_scene_len': args.min_scene_len,
                 'detector': args.detector,
+                'jobs': args.jobs,
+                'profile': args.profile,
+                'backend': args.backend,
+                'keyframes_only': args.keyframes_only,
+                'bisect': args.bisect,
+                'sample_interval': args.sample_interval,
+                'two_pass': args.two_pass,
+                'coarse_stride': args.coarse_stride,
+                'coarse_width': args.coarse_width,
+                'roi': args.roi,
+                'exclude': args.exclude or [],
+                'hysteresis': args.hysteresis,
+                'audio_guided': args.audio_guided,
+                'pause_db': args.pause_db,
                 'extract_frames': args.extract_frames,
                 'frame_type': args.frame_type,
+                'extraction_mode': args.extraction_mode,
+                'dedup_frames': args.dedup_frames,
+                'image_format': args.image_format,
+                'frame_quality': args.frame_quality,
+                'max_size': args.max_size,
+                'frame_sizes': args.frame_sizes,
+                'stream': args.stream,
                 'extract_clips': args.extract_clips,
+                'clip_mode': args.clip_mode,
                 'generate_html': args.generate_html,
                 'split_equal': args.split_equal
             }
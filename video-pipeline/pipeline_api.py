@@ -381,11 +381,13 @@ class PipelineAPI:
         clips_dir = scenes_dir / "clips"
         
         if frames_dir.exists():
-            frame_count = len(list(frames_dir.glob("*.jpg")))
+            # Renditions of a frame in frames/<size>/ share its file name
+            frame_count = len({path.name for path in frames_dir.rglob("*") if path.suffix in ('.jpg', '.webp', '.png')})
             self._log(f"   Extracted frames: {frame_count}")
         
         if clips_dir.exists():
-            clip_count = len(list(clips_dir.glob("*.mp4")))
+            # --clip-mode hls writes a playlist per scene instead of a clip file
+            clip_count = len(list(clips_dir.glob("scene_*.mp4"))) + len(list(clips_dir.glob("scene_*.m3u8")))
             self._log(f"   Extracted clips: {clip_count}")
         
         # Проверяем HTML отчет
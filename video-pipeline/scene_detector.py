@@ -4,121 +4,2783 @@ Script for detecting and extracting scenes from video
 Step 2: Scene detector with PySceneDetect
 """
 
+from __future__ import annotations
+
 import os
 import sys
 import argparse
+import time
+import csv
+import shutil
+import subprocess
+import threading
+import queue
+import re
+import math
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Tuple, Optional
+from urllib.parse import urlparse
+from typing import List, Tuple, Optional, Dict, Iterator, Callable, TYPE_CHECKING
+import importlib
 import json
 
-try:
-    from scenedetect import detect, ContentDetector, AdaptiveDetector
-    from scenedetect.video_manager import VideoManager
-    from scenedetect.scene_manager import SceneManager
-    from scenedetect.frame_timecode import FrameTimecode
-    from scenedetect.stats_manager import StatsManager
-except ImportError:
-    print("❌ PySceneDetect not installed!")
-    print("   Install: pip install scenedetect[opencv]")
-    sys.exit(1)
-
-try:
-    import cv2
-except ImportError:
-    print("❌ OpenCV not installed!")
-    print("   Install: pip install opencv-python")
-    sys.exit(1)
+from video_info import VideoInfo, KeyframeIndex, probe_video, load_keyframe_index
+
+if TYPE_CHECKING:
+    from scenedetect import FrameTimecode
+
+__version__ = "1.0.0"
+
+
+class _LazyModule:
+    """
+    Module imported on first attribute access
+    
+    PySceneDetect pulls in OpenCV and NumPy, which take most of the startup
+    time, so they are only imported once a detector or backend needs them.
+    A missing dependency is reported at that point.
+    """
+    
+    def __init__(self, name: str, install_hint: str):
+        """
+        :param name: Module name
+        :param install_hint: Message for ImportError if the module is missing
+        """
+        self._name = name
+        self._install_hint = install_hint
+    
+    def __getattr__(self, attr: str):
+        try:
+            module = importlib.import_module(self._name)
+        except ImportError as e:
+            raise ImportError(self._install_hint) from e
+        
+        # Later lookups are served from the instance dictionary
+        self.__dict__.update(module.__dict__)
+        return getattr(module, attr)
+
+
+scenedetect = _LazyModule('scenedetect', "PySceneDetect not installed! Install: pip install scenedetect[opencv]")
+sd_scene_manager = _LazyModule('scenedetect.scene_manager', "PySceneDetect not installed! Install: pip install scenedetect[opencv]")
+cv2 = _LazyModule('cv2', "OpenCV not installed! Install: pip install opencv-python")
+np = _LazyModule('numpy', "NumPy not installed! Install: pip install numpy")
+
+# Packages checked by --check: (import name, distribution name, required)
+DEPENDENCIES = [
+    ('scenedetect', 'scenedetect', True),
+    ('cv2', 'opencv-python', True),
+    ('numpy', 'numpy', True),
+]
+
+
+# Detection profiles: downscale factor (0 = PySceneDetect auto, ~256px wide)
+# and frame stride (analyse every Nth frame)
+DETECTION_PROFILES = {
+    'full': {'downscale': 0, 'frame_stride': 1},
+    'fast': {'downscale': 8, 'frame_stride': 2},
+}
+
+
+# Coarse pass of two-pass detection flags windows scoring above this share of the threshold
+COARSE_THRESHOLD_RATIO = 0.8
+
+# Audio-guided detection: analysis rate, RMS window and shortest pause (seconds)
+AUDIO_SAMPLE_RATE = 8000
+AUDIO_WINDOW = 0.05
+AUDIO_MIN_PAUSE = 0.25
+
+# Frame decoding backends for built-in detection loops
+DECODE_BACKENDS = ['opencv', 'ffmpeg-pipe']
+
+# Best frame selection keeps one scored candidate per this many frames
+FRAME_SCORE_BUCKET = 10
+
+# Frame deduplication: what happens to near duplicates of an earlier extracted
+# frame and the largest Hamming distance between their 64-bit perceptual hashes
+FRAME_DEDUP_MODES = ['mark', 'skip']
+FRAME_DEDUP_DISTANCE = 6
+
+# Hashes ignore brightness and color (uniform frames all hash alike), so
+# duplicates must also match in mean color, per BGR channel (0-255)
+FRAME_DEDUP_COLOR_TOLERANCE = 10
+
+# Frame image formats: OpenCV encoder parameter and its default value
+# (quality for JPEG/WebP, compression level for PNG)
+FRAME_FORMATS = {
+    'jpg': ('IMWRITE_JPEG_QUALITY', 95),
+    'webp': ('IMWRITE_WEBP_QUALITY', 90),
+    'png': ('IMWRITE_PNG_COMPRESSION', 3),
+}
+
+# Threads encoding and writing extracted frames
+FRAME_WRITER_WORKERS = min(4, os.cpu_count() or 1)
+
+# Frame timestamp in ffmpeg showinfo filter output
+SHOWINFO_PTS_RE = re.compile(r'pts_time:\s*(-?[\d.]+)')
+
+# Clips are cut in one pass with the segment muxer when they cover at least
+# this share of the video, sparser subsets are cut clip by clip with input seeking
+CLIP_SEGMENT_MIN_COVERAGE = 0.5
+
+# Clip cutting modes: stream copy (starts at keyframes), smart (re-encodes only
+# the partial GOPs at the clip edges), full re-encoding and hls (per-scene
+# byte-range playlists into one fMP4 copy of the video, no clip files)
+CLIP_MODES = ['copy', 'smart', 'reencode', 'hls']
+
+# Name of the single-file fMP4 HLS rendition in clips/ (.m3u8 playlist, .m4s media)
+HLS_RENDITION = "video"
+
+# Local hls.js build copied next to the HTML report so playlists play offline in
+# browsers without native HLS (Safari plays them natively); set HLS_JS to override
+HLS_JS_PATH = Path(os.environ.get('HLS_JS', Path(__file__).parent / 'vendor' / 'hls.min.js'))
+
+# Encoders for re-encoded clips and smart-cut edges by source codec
+CLIP_ENCODERS = {'h264': 'libx264', 'hevc': 'libx265'}
+CLIP_ENCODE_ARGS = ["-crf", "18", "-preset", "veryfast"]
+
+# ffmpeg input options for HLS playlists (same as m3u8_converter.py)
+STREAM_INPUT_ARGS = ["-protocol_whitelist", "file,crypto,data,http,https,tcp,tls", "-allowed_extensions", "ALL"]
+
+
+def _is_stream_source(source: str) -> bool:
+    """
+    Check if the video source is an HLS stream (URL or m3u8 playlist)
+    
+    :param source: Video path or URL
+    :return: True for streams that are read with ffmpeg only
+    """
+    return str(source).startswith(('http://', 'https://')) or str(source).lower().endswith('.m3u8')
+
+
+def _stream_conflicts(jobs: int = 1,
+                      backend: str = 'opencv',
+                      keyframes_only: bool = False,
+                      bisect: bool = False,
+                      two_pass: bool = False,
+                      audio_guided: bool = False) -> List[str]:
+    """
+    Detection options that per-frame scene streaming can't honour
+    
+    Streaming runs one in-process SceneManager over every frame, so sharded,
+    ffmpeg-pipe, sparse and multi-pass detection modes don't fit it.
+    
+    :param jobs: Number of parallel processes
+    :param backend: Frame decoding backend
+    :param keyframes_only: Keyframes only mode
+    :param bisect: Bisection mode
+    :param two_pass: Two-pass mode
+    :param audio_guided: Audio-guided mode
+    :return: Command line names of the conflicting options that are set
+    """
+    conflicts = []
+    if jobs > 1:
+        conflicts.append("--jobs")
+    if backend != 'opencv':
+        conflicts.append("--backend")
+    if keyframes_only:
+        conflicts.append("--keyframes-only")
+    if bisect:
+        conflicts.append("--bisect")
+    if two_pass:
+        conflicts.append("--two-pass")
+    if audio_guided:
+        conflicts.append("--audio-guided")
+    return conflicts
+
+
+def _create_detector(detector_type: str, threshold: float, min_scene_frames: int, luma_only: bool = False):
+    """
+    Create PySceneDetect detector
+    
+    :param detector_type: Detector type ('content' or 'adaptive')
+    :param threshold: Sensitivity threshold
+    :param min_scene_frames: Minimum scene length in frames
+    :param luma_only: Compare only brightness of frames
+    :return: Detector instance
+    """
+    if detector_type == 'adaptive':
+        return scenedetect.AdaptiveDetector(
+            adaptive_threshold=threshold,
+            min_scene_len=min_scene_frames,
+            luma_only=luma_only
+        )
+    return scenedetect.ContentDetector(
+        threshold=threshold,
+        min_scene_len=min_scene_frames,
+        luma_only=luma_only
+    )
+
+
+def _run_scene_manager(video_path: str,
+                       detector,
+                       downscale: int = 0,
+                       frame_stride: int = 1,
+                       start_frame: Optional[int] = None,
+                       end_frame: Optional[int] = None,
+                       stats_file_path: Optional[str] = None,
+                       quality: Optional[FrameQualityTracker] = None) -> List[Tuple[FrameTimecode, FrameTimecode]]:
+    """
+    Run PySceneDetect SceneManager over (a part of) the video
+    
+    :param video_path: Path to video file
+    :param detector: Detector instance
+    :param downscale: Downscale factor (0 = automatic)
+    :param frame_stride: Analyse every Nth frame
+    :param start_frame: First frame to analyse
+    :param end_frame: Frame to stop at
+    :param stats_file_path: Path for saving per-frame metrics (requires frame_stride 1)
+    :param quality: Tracker scoring the analysed frames for best frame selection
+    :return: List of scenes with timestamps
+    """
+    video = scenedetect.open_video(video_path)
+    if start_frame:
+        video.seek(start_frame)
+    
+    scene_manager = scenedetect.SceneManager(scenedetect.StatsManager() if stats_file_path else None)
+    if downscale:
+        scene_manager.auto_downscale = False
+        scene_manager.downscale = downscale
+    if quality:
+        scene_manager.add_detector(_create_quality_detector(quality))
+    scene_manager.add_detector(detector)
+    scene_manager.detect_scenes(video=video, end_time=end_frame, frame_skip=frame_stride - 1)
+    
+    if stats_file_path:
+        scene_manager.stats_manager.save_to_csv(csv_file=stats_file_path)
+    
+    return scene_manager.get_scene_list()
+
+
+def _detect_shard(video_path: str,
+                  detector_type: str,
+                  threshold: float,
+                  min_scene_frames: int,
+                  downscale: int,
+                  frame_stride: int,
+                  start_frame: int,
+                  end_frame: int,
+                  luma_only: bool = False,
+                  score_frames: bool = False) -> Tuple[List[int], Dict[int, Tuple[float, int, float, float]]]:
+    """
+    Detect scene cuts in a frame range (runs in a worker process)
+    
+    :return: Tuple (frame numbers of detected cuts, frame quality candidates if score_frames is set)
+    """
+    detector = _create_detector(detector_type, threshold, min_scene_frames, luma_only)
+    quality = FrameQualityTracker() if score_frames else None
+    scene_list = _run_scene_manager(
+        video_path, detector, downscale, frame_stride, start_frame=start_frame, end_frame=end_frame,
+        quality=quality
+    )
+    return [start.get_frames() for start, _ in scene_list[1:]], quality.candidates if quality else {}
+
+
+def _cuts_from_scores(detector_type: str,
+                      threshold: float,
+                      min_scene_frames: int,
+                      scores: List[float],
+                      frame_nums: Optional[List[int]] = None) -> List[int]:
+    """
+    Run detector cut logic over precomputed per-frame scores
+    
+    The detector's frame score calculation is replaced with a lookup, so
+    thresholds, minimum scene length and flash filtering behave exactly as
+    during a normal decode.
+    
+    :param detector_type: Detector type ('content' or 'adaptive')
+    :param threshold: Sensitivity threshold
+    :param min_scene_frames: Minimum scene length in frames
+    :param scores: content_val for every analysed frame
+    :param frame_nums: Frame numbers of the scores (default: every frame from 0)
+    :return: Frame numbers of detected cuts
+    """
+    if frame_nums is None:
+        frame_nums = range(len(scores))
+    
+    detector = _create_detector(detector_type, threshold, min_scene_frames)
+    frame_scores = iter(scores)
+    detector._calculate_frame_score = lambda frame_num, frame_img: float(next(frame_scores))
+    
+    cuts = []
+    for frame_num in frame_nums:
+        cuts += detector.process_frame(frame_num, None)
+    if len(frame_nums):
+        cuts += detector.post_process(frame_nums[-1])
+    
+    return sorted(set(cuts))
+
+
+def _read_showinfo(stream, timestamps: 'queue.Queue', errors: List[str]):
+    """
+    Read ffmpeg stderr, put frame timestamps from showinfo into a queue
+    
+    :param stream: ffmpeg stderr
+    :param timestamps: Queue for pts_time values (None marks the end)
+    :param errors: List collecting other log lines
+    """
+    try:
+        for line in iter(stream.readline, b''):
+            line = line.decode(errors='replace')
+            match = SHOWINFO_PTS_RE.search(line)
+            if match and 'Parsed_showinfo' in line:
+                timestamps.put(float(match.group(1)))
+            elif line.strip():
+                errors.append(line.strip())
+    finally:
+        timestamps.put(None)
+
+
+def _read_log(stream, lines: List[str]):
+    """
+    Read ffmpeg stderr into a list of lines
+    
+    Runs on a thread while stdout is read, so ffmpeg never blocks on a
+    full stderr pipe.
+    
+    :param stream: ffmpeg stderr
+    :param lines: List collecting non-empty log lines
+    """
+    for line in iter(stream.readline, b''):
+        line = line.decode(errors='replace').strip()
+        if line:
+            lines.append(line)
+
+
+def _audio_rms(video_path: Path, window: float = AUDIO_WINDOW) -> Optional['np.ndarray']:
+    """
+    Decode the audio track with ffmpeg and compute windowed RMS
+    
+    :param video_path: Path to video file
+    :param window: RMS window length in seconds
+    :return: RMS of consecutive windows or None if the video has no audio
+    """
+    if not shutil.which("ffmpeg"):
+        raise RuntimeError("FFmpeg not found, install FFmpeg to use audio-guided detection")
+    
+    cmd = [
+        "ffmpeg", "-hide_banner", "-nostats", "-v", "error",
+        "-i", str(video_path),
+        "-vn", "-map", "0:a:0?",
+        "-ac", "1", "-ar", str(AUDIO_SAMPLE_RATE),
+        "-f", "s16le", "-"
+    ]
+    result = subprocess.run(cmd, capture_output=True)
+    if result.returncode != 0 or not result.stdout:
+        return None
+    
+    samples = np.frombuffer(result.stdout, dtype=np.int16).astype(np.float32) / 32768
+    window_size = max(1, int(AUDIO_SAMPLE_RATE * window))
+    count = len(samples) // window_size
+    if count == 0:
+        return None
+    
+    return np.sqrt(np.mean(samples[:count * window_size].reshape(count, window_size) ** 2, axis=1))
+
+
+def _content_score(frame_a: 'np.ndarray', frame_b: 'np.ndarray') -> float:
+    """
+    ContentDetector score between two frames of the same size
+    
+    :param frame_a: BGR frame or luma plane
+    :param frame_b: BGR frame or luma plane
+    :return: Mean absolute HSV (or luma) difference
+    """
+    if frame_a.ndim == 3:
+        frame_a = cv2.cvtColor(frame_a, cv2.COLOR_BGR2HSV)
+        frame_b = cv2.cvtColor(frame_b, cv2.COLOR_BGR2HSV)
+    return float(cv2.absdiff(frame_a, frame_b).mean())
+
+
+def _parse_sizes(text: str) -> List[int]:
+    """
+    Parse frame sizes given as "256,1024,full"
+    
+    :param text: Comma separated longest sides in pixels, 'full' for the original size
+    :return: Sizes (0 = full size) without duplicates
+    """
+    sizes = []
+    for part in text.split(','):
+        part = part.strip().lower()
+        if part == 'full':
+            size = 0
+        elif part.isdigit() and int(part) > 0:
+            size = int(part)
+        else:
+            raise argparse.ArgumentTypeError(f"invalid frame size '{part}', expected pixels or 'full'")
+        if size not in sizes:
+            sizes.append(size)
+    return sizes
+
+
+def _size_label(size: int) -> str:
+    """Name of a frame size (its subdirectory under frames/)"""
+    return str(size) if size else 'full'
+
+
+def _fit_size(width: int, height: int, max_size: int) -> Tuple[int, int]:
+    """
+    Frame dimensions with the longest side limited to max_size
+    
+    :param width: Frame width
+    :param height: Frame height
+    :param max_size: Longest side in pixels (0 = no limit)
+    :return: Tuple (width, height)
+    """
+    if not max_size or max(width, height) <= max_size:
+        return width, height
+    scale = max_size / max(width, height)
+    return max(1, round(width * scale)), max(1, round(height * scale))
+
+
+def _parse_rect(text: str) -> Tuple[int, int, int, int]:
+    """
+    Parse rectangle given as "x,y,w,h" in pixels
+    
+    :param text: Rectangle string
+    :return: Tuple (x, y, width, height)
+    """
+    try:
+        parts = [int(part) for part in text.split(',')]
+    except ValueError:
+        parts = []
+    if len(parts) != 4 or min(parts) < 0 or parts[2] == 0 or parts[3] == 0:
+        raise argparse.ArgumentTypeError(f"invalid rectangle '{text}', expected x,y,w,h")
+    return tuple(parts)
+
+
+class FrameReader:
+    """
+    Random access frame reader over a single VideoCapture
+    
+    Short forward jumps are done with grab() instead of a seek, frames are
+    downscaled to the detection size and counted, so callers can report how
+    much of the video was actually decoded.
+    
+    With a keyframe index the cost of a seek is known in advance: OpenCV
+    seeks to the keyframe before (frame - SEEK_BACKOFF) and decodes forward
+    from it. Forward jumps are grabbed whenever that's cheaper, and frames
+    decoded inside seeks are counted too.
+    """
+    
+    # Frames OpenCV steps back from the target before seeking to a keyframe
+    SEEK_BACKOFF = 16
+    
+    def __init__(self,
+                 video_path: Path,
+                 downscale: int = 0,
+                 max_forward_grab: int = 8,
+                 keyframes: Optional[KeyframeIndex] = None):
+        """
+        :param video_path: Path to video file
+        :param downscale: Downscale factor (0 = same as PySceneDetect's automatic one, 1 = full size)
+        :param max_forward_grab: Longest forward jump done by grabbing frames instead of seeking
+                                 (used without keyframe index)
+        :param keyframes: Keyframe index of the video
+        """
+        self.cap = cv2.VideoCapture(str(video_path))
+        width = int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+        height = int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        
+        downscale = downscale or sd_scene_manager.compute_downscale_factor(width)
+        self.size = (round(width / downscale), round(height / downscale))
+        self.downscale = downscale
+        self.max_forward_grab = max_forward_grab
+        self.keyframes = keyframes if keyframes is not None and len(keyframes) else None
+        
+        self.decoded = 0
+        self.seeks = 0
+        self._position = 0  # Number of the next frame the capture returns
+    
+    def read(self, frame_num: int) -> Optional['np.ndarray']:
+        """
+        Read downscaled frame
+        
+        :param frame_num: Frame number
+        :return: BGR frame or None if it can't be read
+        """
+        if not self._can_grab_to(frame_num):
+            self.cap.set(cv2.CAP_PROP_POS_FRAMES, frame_num)
+            self.seeks += 1
+            if self.keyframes:
+                self.decoded += frame_num - self._seek_start(frame_num)
+            self._position = frame_num
+        
+        while self._position < frame_num:
+            if not self.cap.grab():
+                return None
+            self._position += 1
+            self.decoded += 1
+        
+        ret, frame = self.cap.read()
+        if not ret:
+            return None
+        self._position += 1
+        self.decoded += 1
+        
+        if self.downscale > 1:
+            frame = cv2.resize(frame, self.size, interpolation=cv2.INTER_LINEAR)
+        return frame
+    
+    def _can_grab_to(self, frame_num: int) -> bool:
+        """Whether decoding forward to a frame is cheaper than seeking"""
+        if frame_num < self._position:
+            return False
+        if self.keyframes:
+            return self._position >= self._seek_start(frame_num)
+        return frame_num - self._position <= self.max_forward_grab
+    
+    def _seek_start(self, frame_num: int) -> int:
+        """Keyframe a seek to a frame decodes from"""
+        return self.keyframes.preceding_frame(max(0, frame_num - self.SEEK_BACKOFF))
+    
+    def release(self):
+        """Release video capture"""
+        self.cap.release()
+
+
+class KeyframeReader:
+    """
+    Frame reader that never decodes a GOP before the one holding the frame
+    
+    OpenCV seeks to the keyframe before (frame - SEEK_BACKOFF), so a frame
+    early in a GOP, the keyframe itself included, costs the whole previous
+    GOP too. Those seeks go to an ffmpeg process started at the frame's own
+    keyframe instead, whose downscaled frames are read from a pipe; later
+    frames are seeked by OpenCV, which lands on the same keyframe without
+    starting a process. Reads further on continue the current decoder, and
+    frames decoded by either are counted. Same interface as FrameReader.
+    """
+    
+    def __init__(self,
+                 video_path: Path,
+                 keyframes: KeyframeIndex,
+                 fps: float,
+                 downscale: int = 0):
+        """
+        :param video_path: Path to video file
+        :param keyframes: Keyframe index of the video
+        :param fps: Video FPS
+        :param downscale: Downscale factor (0 = same as PySceneDetect's automatic one, 1 = full size)
+        """
+        self.video_path = video_path
+        self.keyframes = keyframes
+        self.fps = fps
+        self.capture = FrameReader(video_path, downscale, keyframes=keyframes)
+        self.size = self.capture.size
+        
+        self._pipe_seeks = 0
+        self._pipe_decoded = 0
+        self._position = 0  # Number of the next frame the pipe returns
+        self._process = None
+        self._log_reader = None
+        self._errors = []
+        self._scratch = np.empty((self.size[1], self.size[0], 3), dtype=np.uint8)
+    
+    @property
+    def decoded(self) -> int:
+        return self.capture.decoded + self._pipe_decoded
+    
+    @property
+    def seeks(self) -> int:
+        return self.capture.seeks + self._pipe_seeks
+    
+    def read(self, frame_num: int) -> Optional['np.ndarray']:
+        """
+        Read downscaled frame
+        
+        :param frame_num: Frame number
+        :return: BGR frame or None if it can't be read
+        """
+        # Each decoder continues forward only inside the frame's GOP
+        keyframe = self.keyframes.preceding_frame(frame_num)
+        if self._process is not None and keyframe <= self._position <= frame_num:
+            return self._read_pipe(frame_num)
+        if keyframe <= self.capture._position <= frame_num or frame_num - keyframe >= FrameReader.SEEK_BACKOFF:
+            self._stop()
+            return self.capture.read(frame_num)
+        
+        self._start(keyframe)
+        return self._read_pipe(frame_num)
+    
+    def _start(self, keyframe: int):
+        """Start ffmpeg at a keyframe"""
+        self._stop()
+        cmd = [
+            "ffmpeg", "-hide_banner", "-nostats", "-v", "error",
+            # Output starts at the keyframe a quarter frame before the seek time
+            "-noaccurate_seek",
+            "-ss", f"{self.keyframes.time_of(keyframe) + 0.25 / self.fps:.6f}",
+            "-i", str(self.video_path),
+            "-an",
+            "-vf", f"scale={self.size[0]}:{self.size[1]}",
+            "-f", "rawvideo",
+            "-pix_fmt", "bgr24",
+            "-"
+        ]
+        self._process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        self._errors = []
+        self._log_reader = threading.Thread(target=_read_log, args=(self._process.stderr, self._errors), daemon=True)
+        self._log_reader.start()
+        self._position = keyframe
+        self._pipe_seeks += 1
+    
+    def _read_pipe(self, frame_num: int) -> Optional['np.ndarray']:
+        """Read a frame at or after the pipe position"""
+        while self._position < frame_num:
+            if not self._read_into(self._scratch):
+                return None
+        
+        frame = np.empty_like(self._scratch)
+        return frame if self._read_into(frame) else None
+    
+    def _read_into(self, frame: 'np.ndarray') -> bool:
+        """Read the next frame from the pipe into an array"""
+        if self._process.stdout.readinto(memoryview(frame).cast('B')) != frame.nbytes:
+            return False
+        self._position += 1
+        self._pipe_decoded += 1
+        return True
+    
+    def _stop(self):
+        """Stop the running ffmpeg process"""
+        if self._process is None:
+            return
+        self._process.stdout.close()
+        if self._process.poll() is None:
+            self._process.kill()
+        self._log_reader.join()
+        self._process.wait()
+        if self._process.returncode not in (0, -9) and self._errors:
+            print(f"   ffmpeg: {self._errors[-1].strip()}")
+        self._process = None
+    
+    def release(self):
+        """Stop ffmpeg and release video capture"""
+        self._stop()
+        self.capture.release()
+
+
+class FrameWriter:
+    """
+    Frame encoder and writer running on a bounded thread pool
+    
+    OpenCV releases the GIL while resizing and encoding, so frames are
+    encoded in parallel with each other and with decoding of the next
+    frames. At most two frames per thread wait for encoding; write() blocks
+    beyond that, which keeps memory bounded when decoding is faster.
+    Without threads frames are encoded in the caller.
+    
+    With several sizes every frame is written once per size into
+    subdirectories named after them, each rendition downscaled from the
+    next larger one.
+    """
+    
+    def __init__(self,
+                 image_format: str = 'jpg',
+                 quality: Optional[int] = None,
+                 max_size: int = 0,
+                 workers: int = 0,
+                 sizes: Optional[List[int]] = None):
+        """
+        :param image_format: Image format ('jpg', 'webp' or 'png')
+        :param quality: JPEG/WebP quality 1-100 (default per format), ignored for PNG
+        :param max_size: Longest side in pixels, larger frames are downscaled (0 = full size)
+        :param workers: Encoding threads (0 = encode synchronously)
+        :param sizes: Longest sides of renditions in subdirectories (0 = full size), replaces max_size
+        """
+        if image_format not in FRAME_FORMATS:
+            raise ValueError(f"Unsupported image format: {image_format}")
+        
+        self.image_format = image_format
+        self.extension = f".{image_format}"
+        flag, default_value = FRAME_FORMATS[image_format]
+        self.quality = None if image_format == 'png' else (quality or default_value)
+        self.params = [getattr(cv2, flag), self.quality or default_value]
+        self.max_size = max_size
+        self.workers = workers
+        # Largest first, so smaller renditions are scaled from larger ones
+        self.sizes = sorted(sizes, key=lambda size: size or sys.maxsize, reverse=True) if sizes else None
+        
+        self.frames = 0
+        self.bytes_written = 0
+        self.encode_time = 0.0
+        self.failed = set()
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=workers) if workers > 0 else None
+        self._pending = threading.BoundedSemaphore(2 * workers) if workers > 0 else None
+    
+    def outputs(self, output_path: Path) -> List[Tuple[Path, int]]:
+        """
+        Files written for a frame
+        
+        :param output_path: Output image path (file name for every rendition)
+        :return: List of (path, longest side) pairs, largest first
+        """
+        if not self.sizes:
+            return [(output_path, self.max_size)]
+        return [(output_path.parent / _size_label(size) / output_path.name, size) for size in self.sizes]
+    
+    def write(self, frame: 'np.ndarray', output_path: Path):
+        """
+        Encode and write a frame in all sizes (queued when running on threads)
+        
+        :param frame: BGR frame, must not be modified afterwards
+        :param output_path: Output image path (file name for every rendition)
+        """
+        if self._executor is None:
+            self._encode(frame, output_path)
+            return
+        
+        self._pending.acquire()
+        future = self._executor.submit(self._encode, frame, output_path)
+        future.add_done_callback(lambda _: self._pending.release())
+    
+    def close(self):
+        """Wait until all queued frames are written and stop the threads"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+    
+    def _encode(self, frame: 'np.ndarray', output_path: Path):
+        """Resize, encode and write one frame in all sizes, recording bytes and time"""
+        start_time = time.perf_counter()
+        written = 0
+        for path, max_size in self.outputs(output_path):
+            try:
+                size = _fit_size(frame.shape[1], frame.shape[0], max_size)
+                if size != (frame.shape[1], frame.shape[0]):
+                    frame = cv2.resize(frame, size, interpolation=cv2.INTER_AREA)
+                
+                ok, data = cv2.imencode(self.extension, frame, self.params)
+                if not ok:
+                    raise RuntimeError(f"can't encode {self.image_format}")
+                if self.sizes:
+                    path.parent.mkdir(exist_ok=True)
+                path.write_bytes(data.tobytes())
+                written += len(data)
+            except Exception as e:
+                print(f"   Error writing frame {path}: {e}")
+                with self._lock:
+                    self.failed.add(path)
+        
+        with self._lock:
+            self.frames += 1
+            self.bytes_written += written
+            self.encode_time += time.perf_counter() - start_time
+    
+    def summary(self) -> str:
+        """Encoding settings, throughput and bytes written"""
+        settings = self.image_format + (f" q{self.quality}" if self.quality else "")
+        if self.sizes:
+            settings += f", sizes {'/'.join(_size_label(size) for size in self.sizes)}"
+        elif self.max_size:
+            settings += f", max {self.max_size}px"
+        threads = f"{self.workers} thread{'s' if self.workers > 1 else ''}" if self.workers else "synchronous"
+        speed = f"{self.frames / self.encode_time:.1f} frames/s per thread" if self.encode_time > 0 else "n/a"
+        return (f"Encoding ({settings}, {threads}): {self.frames} frames, {speed}, "
+                f"{self.bytes_written / (1024 * 1024):.2f} MB written")
+
+
+class BatchContentDetector:
+    """
+    Content detector working on batches of frames with NumPy
+    
+    Computes the same frame score as PySceneDetect's ContentDetector with
+    default weights (mean absolute difference of hue, saturation and
+    luma between consecutive frames), but with one color conversion and one
+    array difference per batch instead of Python work per frame. Grayscale
+    batches are compared on luma only.
+    """
+    
+    def __init__(self, threshold: float = 30.0, min_scene_len: int = 15):
+        """
+        :param threshold: Score a frame must reach to trigger a cut
+        :param min_scene_len: Minimum scene length in frames
+        """
+        self.threshold = threshold
+        self.min_scene_len = min_scene_len
+        self.frame_nums = []
+        self.scores = []
+        self._last_frame = None
+    
+    def process_batch(self, frame_nums: List[int], frames: 'np.ndarray') -> 'np.ndarray':
+        """
+        Compute scores for a batch of consecutive analysed frames
+        
+        :param frame_nums: Frame numbers of the batch
+        :param frames: Array of shape (N, H, W, 3) with BGR frames or (N, H, W) with luma
+        :return: Scores of the batch frames
+        """
+        count = frames.shape[0]
+        frame_shape = frames.shape[1:]
+        
+        # Previous frame followed by the batch, so both sides of the difference
+        # are contiguous views of one array
+        planes = np.empty((count + 1,) + frame_shape, dtype=np.uint8)
+        
+        if frames.ndim == 4:
+            # Convert the whole batch with a single call by stacking frames vertically
+            height, width, _ = frame_shape
+            cv2.cvtColor(frames.reshape(count * height, width, 3), cv2.COLOR_BGR2HSV,
+                         dst=planes[1:].reshape(count * height, width, 3))
+        else:
+            planes[1:] = frames
+        
+        planes[0] = planes[1] if self._last_frame is None else self._last_frame
+        self._last_frame = planes[-1].copy()
+        
+        # Mean absolute difference per frame, averaged over channels
+        rows = count * frame_shape[0]
+        diff = cv2.absdiff(planes[1:].reshape(rows, -1), planes[:-1].reshape(rows, -1))
+        pixels = int(np.prod(frame_shape))
+        batch_scores = diff.reshape(count, -1).sum(axis=1, dtype=np.uint64) / pixels
+        
+        self.frame_nums.extend(frame_nums)
+        self.scores.extend(batch_scores.tolist())
+        return batch_scores
+    
+    def get_cuts(self) -> List[int]:
+        """Frame numbers of detected cuts with ContentDetector's min_scene_len filtering"""
+        return _cuts_from_scores('content', self.threshold, self.min_scene_len, self.scores, self.frame_nums)
+
+
+class SlideDetector:
+    """
+    Slide change detector for screencasts and lectures
+    
+    Compares grayscale frames against the last stable frame instead of the
+    previous one. A change must stay above the threshold for a number of
+    consecutive analysed frames before the cut is confirmed, so short
+    flashes, cursor movement and pop-ups don't split slides. Excluded
+    rectangles (webcam overlays, clocks) are blanked before comparing.
+    """
+    
+    def __init__(self,
+                 threshold: float = 30.0,
+                 min_scene_len: int = 15,
+                 hysteresis: int = 3,
+                 exclude: Optional[List[Tuple[int, int, int, int]]] = None):
+        """
+        :param threshold: Mean absolute luma difference (0-255) that counts as a change
+        :param min_scene_len: Minimum scene length in frames
+        :param hysteresis: Analysed frames a change must persist before a cut is confirmed
+        :param exclude: Rectangles (x, y, w, h) in frame coordinates to ignore
+        """
+        self.threshold = threshold
+        self.min_scene_len = min_scene_len
+        self.hysteresis = max(1, hysteresis)
+        self.exclude = exclude or []
+        self.cuts = []
+        self._reference = None
+        self._pixels = None
+        self._pending_start = None
+        self._pending_count = 0
+        self._last_cut = 0
+    
+    def process_batch(self, frame_nums: List[int], frames: 'np.ndarray'):
+        """
+        Process a batch of consecutive analysed frames
+        
+        :param frame_nums: Frame numbers of the batch
+        :param frames: Array of shape (N, H, W) with luma, excluded areas are blanked in place
+        """
+        for x, y, width, height in self.exclude:
+            frames[:, y:y + height, x:x + width] = 0
+        
+        if self._pixels is None:
+            mask = np.ones(frames.shape[1:], dtype=bool)
+            for x, y, width, height in self.exclude:
+                mask[y:y + height, x:x + width] = False
+            self._pixels = max(1, int(mask.sum()))
+        
+        for frame_num, frame in zip(frame_nums, frames):
+            if self._reference is None:
+                self._reference = frame.copy()
+                continue
+            
+            score = float(cv2.absdiff(frame, self._reference).sum()) / self._pixels
+            
+            if score < self.threshold:
+                # Back to (or still on) the same slide, follow slow drift
+                self._reference[:] = frame
+                self._pending_start = None
+                self._pending_count = 0
+                continue
+            
+            if self._pending_start is None:
+                self._pending_start = frame_num
+            self._pending_count += 1
+            
+            if self._pending_count >= self.hysteresis:
+                if self._pending_start - self._last_cut >= self.min_scene_len:
+                    self.cuts.append(self._pending_start)
+                    self._last_cut = self._pending_start
+                self._reference[:] = frame
+                self._pending_start = None
+                self._pending_count = 0
+    
+    def get_cuts(self) -> List[int]:
+        """Frame numbers of confirmed cuts"""
+        return list(self.cuts)
+
+
+class FrameQualityTracker:
+    """
+    Sharpness and stability scores of analysed frames for 'best' frame selection
+    
+    Runs on the downscaled frames the detector already decodes. A frame's
+    score is one plus its Laplacian variance (sharpness) divided by one plus
+    the mean absolute luma difference from the previous analysed frame
+    (motion, so frames in transitions and fast movement lose). The offset
+    keeps motion in play on flat scenes with no sharpness, and equal scores
+    go to the stiller frame. Cuts are not known while scanning, so only the
+    top frame of every bucket of consecutive frames is kept, and a scene's
+    best frame is picked among the buckets inside it.
+    """
+    
+    def __init__(self, bucket: int = FRAME_SCORE_BUCKET):
+        """
+        :param bucket: Frames per bucket that keep one candidate
+        """
+        self.bucket = max(1, bucket)
+        self.candidates = {}
+        self._previous = None
+    
+    def process_frame(self, frame_num: int, frame: 'np.ndarray'):
+        """
+        Score an analysed frame and keep it if it is the best of its bucket
+        
+        :param frame_num: Frame number
+        :param frame: BGR frame or luma plane
+        """
+        gray = frame if frame.ndim == 2 else cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        sharpness = float(cv2.Laplacian(gray, cv2.CV_32F).var())
+        if self._previous is not None and self._previous.shape == gray.shape:
+            motion = float(cv2.absdiff(gray, self._previous).mean())
+        else:
+            motion = 0.0
+        self._previous = gray.copy()
+        
+        score = (sharpness + 1.0) / (1.0 + motion)
+        key = frame_num // self.bucket
+        candidate = (score, frame_num, sharpness, motion)
+        if self._better(candidate, self.candidates.get(key)):
+            self.candidates[key] = candidate
+    
+    @staticmethod
+    def _better(candidate: Tuple[float, int, float, float], current: Optional[Tuple[float, int, float, float]]) -> bool:
+        """
+        Check if a candidate beats the current one: higher score, then lower motion
+        
+        :param candidate: Candidate (score, frame number, sharpness, motion)
+        :param current: Current candidate, None if there is none
+        :return: True if the candidate should replace the current one
+        """
+        if current is None:
+            return True
+        return (candidate[0], -candidate[3]) > (current[0], -current[3])
+    
+    def process_batch(self, frame_nums: List[int], frames: 'np.ndarray'):
+        """
+        Score a batch of consecutive analysed frames
+        
+        :param frame_nums: Frame numbers of the batch
+        :param frames: Array of shape (N, H, W, 3) with BGR frames or (N, H, W) with luma
+        """
+        for frame_num, frame in zip(frame_nums, frames):
+            self.process_frame(frame_num, frame)
+    
+    def merge(self, candidates: Dict[int, Tuple[float, int, float, float]]):
+        """
+        Add candidates from another tracker (a detection shard)
+        
+        :param candidates: Bucket candidates (score, frame number, sharpness, motion)
+        """
+        for key, candidate in candidates.items():
+            if self._better(candidate, self.candidates.get(key)):
+                self.candidates[key] = candidate
+    
+    def best(self, start_frame: int, end_frame: int) -> Optional[Dict]:
+        """
+        Best scored frame of a scene
+        
+        :param start_frame: First frame of the scene
+        :param end_frame: Frame after the last one of the scene
+        :return: Dictionary with frame, score, sharpness and motion, None if no frame was scored
+        """
+        best = None
+        for key in range(start_frame // self.bucket, (end_frame - 1) // self.bucket + 1):
+            candidate = self.candidates.get(key)
+            if candidate and start_frame <= candidate[1] < end_frame and self._better(candidate, best):
+                best = candidate
+        if best is None:
+            return None
+        
+        score, frame_num, sharpness, motion = best
+        return {
+            "frame": frame_num,
+            "score": round(score, 2),
+            "sharpness": round(sharpness, 2),
+            "motion": round(motion, 2)
+        }
+
+
+def _create_quality_detector(tracker: FrameQualityTracker):
+    """
+    PySceneDetect detector passing frames to a quality tracker, it never reports cuts
+    
+    :param tracker: Frame quality tracker
+    :return: Detector instance to add to a SceneManager next to the real detector
+    """
+    class QualityDetector(scenedetect.SceneDetector):
+        def process_frame(self, frame_num, frame_img):
+            tracker.process_frame(frame_num, frame_img)
+            return []
+    
+    return QualityDetector()
+
+
+def _frame_hash(frame: 'np.ndarray', method: str = 'phash') -> int:
+    """
+    64-bit perceptual hash of a frame
+    
+    :param frame: BGR frame
+    :param method: 'phash' (signs of low DCT frequencies against their median) or
+                   'dhash' (brightness gradients between neighbouring pixels)
+    :return: Hash as an integer
+    """
+    gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+    if method == 'dhash':
+        small = cv2.resize(gray, (9, 8), interpolation=cv2.INTER_AREA)
+        bits = small[:, 1:] > small[:, :-1]
+    else:
+        small = cv2.resize(gray, (32, 32), interpolation=cv2.INTER_AREA).astype(np.float32)
+        low = cv2.dct(small)[:8, :8]
+        # DC term only carries the average brightness
+        bits = low > np.median(low.flatten()[1:])
+    return int.from_bytes(np.packbits(bits.flatten()).tobytes(), 'big')
+
+
+class FrameHashIndex:
+    """
+    Perceptual hashes of the extracted frames, searchable by Hamming distance
+    
+    Hashes are split into max_distance + 1 bit bands with a lookup table per
+    band. Two hashes within max_distance differ in at most max_distance
+    bands, so a near duplicate shares at least one band exactly and only
+    frames found through the tables are compared bit by bit.
+    """
+    
+    def __init__(self, max_distance: int = FRAME_DEDUP_DISTANCE):
+        """
+        :param max_distance: Largest Hamming distance (of 64 bits) that counts as a duplicate
+        """
+        self.max_distance = max(0, min(max_distance, 63))
+        bands = self.max_distance + 1
+        bounds = [64 * i // bands for i in range(bands + 1)]
+        self._bands = [(start, (1 << (end - start)) - 1) for start, end in zip(bounds, bounds[1:])]
+        self._tables = [{} for _ in self._bands]
+        self._hashes = []
+    
+    def __len__(self) -> int:
+        return len(self._hashes)
+    
+    def find(self, frame_hash: int, accept: Optional[Callable[[object], bool]] = None) -> Optional[Tuple[object, int]]:
+        """
+        Closest indexed frame within max_distance
+        
+        :param frame_hash: Hash to look up
+        :param accept: Additional check of a candidate's key, rejected candidates are ignored
+        :return: Tuple (key, distance) or None if there is no near duplicate
+        """
+        best = None
+        seen = set()
+        for (shift, mask), table in zip(self._bands, self._tables):
+            for position in table.get((frame_hash >> shift) & mask, ()):
+                if position in seen:
+                    continue
+                seen.add(position)
+                other_hash, key = self._hashes[position]
+                distance = bin(frame_hash ^ other_hash).count('1')
+                if distance <= self.max_distance and (best is None or distance < best[1]):
+                    if accept is None or accept(key):
+                        best = (key, distance)
+        return best
+    
+    def add(self, frame_hash: int, key: object):
+        """
+        Index a frame hash
+        
+        :param frame_hash: Hash of the frame
+        :param key: Value returned by find() for this frame
+        """
+        position = len(self._hashes)
+        self._hashes.append((frame_hash, key))
+        for (shift, mask), table in zip(self._bands, self._tables):
+            table.setdefault((frame_hash >> shift) & mask, []).append(position)
 
 
 class SceneExtractor:
     def __init__(self, video_path: str, output_dir: str = None, transcript: str = None):
         """
-        Initialize scene detector
+        Initialize scene detector
+        
+        :param video_path: Path to video file
+        :param output_dir: Directory for saving results
+        :param transcript: Transcript text to include in HTML report
+        """
+        # HLS streams are read by ffmpeg directly; video_path points to the remuxed copy if any
+        self.source = str(video_path) if _is_stream_source(video_path) else None
+        
+        self.video_path = Path(video_path)
+        if not self.source and not self.video_path.exists():
+            raise FileNotFoundError(f"Video file not found: {video_path}")
+        
+        # Create directory for results
+        if output_dir:
+            self.output_dir = Path(output_dir)
+        elif self.source:
+            self.output_dir = Path.cwd() / f"{Path(urlparse(self.source).path).stem or 'stream'}_scenes"
+        else:
+            self.output_dir = self.video_path.parent / f"{self.video_path.stem}_scenes"
+        
+        self.output_dir.mkdir(exist_ok=True)
+        
+        # Subdirectories for different output types
+        self.frames_dir = self.output_dir / "frames"
+        self.clips_dir = self.output_dir / "clips"
+        self.frames_dir.mkdir(exist_ok=True)
+        self.clips_dir.mkdir(exist_ok=True)
+        
+        # Per-frame detector metrics, reused by later runs with other thresholds
+        self.stats_file = self.output_dir / "scenes_stats.csv"
+        
+        # Scene metadata written line by line while scenes are streamed
+        self.metadata_stream_file = self.output_dir / "scenes_metadata.jsonl"
+        
+        # Keyframe positions (pts, byte offset, frame number) used for seeking and cutting
+        self.keyframe_index_file = self.output_dir / "keyframes.npz"
+        
+        self.scenes = []
+        self.scene_list = []
+        self.transcript = transcript
+        
+        self._video_info = None
+        self._video_info_path = None
+        self._keyframe_index = None
+        self._keyframe_index_path = None
+        self._hls_rendition = None
+        self._hls_rendition_path = None
+        
+        # Frame scores of the last detection run, used for 'best' frames
+        self.frame_quality = None
+        
+        # Extracted frame of every scene (file, perceptual hash, canonical scene of duplicates)
+        self.frame_records = {}
+        self._frame_hash_index = None
+        self._frame_dedup = None
+        self._frame_colors = {}
+        self._frame_writer = None
+    
+    @property
+    def video_info(self) -> VideoInfo:
+        """Video properties, probed once per file and cached on disk across runs"""
+        if self._video_info is None or self._video_info_path != self.video_path:
+            self._video_info = probe_video(str(self.video_path))
+            self._video_info_path = self.video_path
+        return self._video_info
+    
+    @property
+    def keyframe_index(self) -> Optional[KeyframeIndex]:
+        """Keyframe index of the video, built once and kept as a sidecar file (None if unavailable)"""
+        if self._keyframe_index_path != self.video_path:
+            self._keyframe_index = load_keyframe_index(str(self.video_path), self.keyframe_index_file)
+            # A remuxed stream copy may not be written yet, try again later
+            self._keyframe_index_path = self.video_path if self.video_path.is_file() else None
+        return self._keyframe_index
+        
+    def detect_scenes(self, 
+                     threshold: float = 30.0,
+                     min_scene_len: float = 0.5,
+                     detector_type: str = 'content',
+                     jobs: int = 1,
+                     use_stats_cache: bool = True,
+                     profile: str = 'full',
+                     downscale: Optional[int] = None,
+                     frame_stride: Optional[int] = None,
+                     backend: str = 'opencv',
+                     luma_only: bool = False,
+                     keyframes_only: bool = False,
+                     bisect: bool = False,
+                     sample_interval: float = 2.0,
+                     two_pass: bool = False,
+                     coarse_stride: int = 10,
+                     coarse_width: int = 64,
+                     roi: Optional[Tuple[int, int, int, int]] = None,
+                     exclude: Optional[List[Tuple[int, int, int, int]]] = None,
+                     hysteresis: int = 3,
+                     audio_guided: bool = False,
+                     pause_db: float = -30.0,
+                     pause_margin: float = 0.5,
+                     audio_recall: bool = False,
+                     score_frames: bool = False) -> List[Tuple[FrameTimecode, FrameTimecode]]:
+        """
+        Detect scenes in video
+        
+        :param threshold: Sensitivity threshold (1-100, lower = more scenes)
+        :param min_scene_len: Minimum scene length in seconds
+        :param detector_type: Detector type ('content', 'adaptive', 'numpy', 'ffmpeg-scene' or 'slides')
+        :param jobs: Number of parallel processes (video is split into time shards)
+        :param use_stats_cache: Save per-frame metrics and reuse them on later runs
+        :param profile: Detection profile ('full' or 'fast')
+        :param downscale: Downscale factor, overrides the profile (0 = automatic)
+        :param frame_stride: Analyse every Nth frame, overrides the profile
+        :param backend: Frame decoding backend ('opencv' or 'ffmpeg-pipe')
+        :param luma_only: Compare only brightness of frames
+        :param keyframes_only: Decode and compare only keyframes (fast triage, cuts land on keyframes)
+        :param bisect: Compare keyframes or sparse samples and search differing intervals for cuts
+        :param sample_interval: Seconds between samples in bisect mode
+        :param two_pass: Find candidate windows in a coarse pass, place cuts in a full-rate pass
+        :param coarse_stride: Analyse every Nth frame in the coarse pass
+        :param coarse_width: Frame width in pixels for the coarse pass
+        :param roi: Region (x, y, w, h) in pixels analysed by the slides detector
+        :param exclude: Regions (x, y, w, h) in pixels ignored by the slides detector
+        :param hysteresis: Analysed frames a slide change must persist (slides detector)
+        :param audio_guided: Examine only frames around pauses in the audio track
+        :param pause_db: Level below which audio counts as a pause, in dB relative to speech
+        :param pause_margin: Seconds of video examined before and after each pause
+        :param audio_recall: Compare audio-guided cuts with a full run (cached stats or a full decode)
+        :param score_frames: Score sharpness and stability of analysed frames for 'best' frame extraction
+        :return: List of scenes with timestamps
+        """
+        # Get video information
+        fps = self.video_info.fps
+        frame_count = self.video_info.frame_count
+        duration = frame_count / fps if fps > 0 else 0
+        
+        settings = self._profile_settings(profile, downscale, frame_stride)
+        
+        print(f"🔍 Analyzing video: {self.video_path.name}")
+        print(f"   Duration: {duration:.2f}s")
+        print(f"   Frames: {frame_count}")
+        print(f"   FPS: {fps:.2f}")
+        print(f"   Video: {self.video_info.resolution}, {self.video_info.codec or 'unknown codec'}")
+        if self.video_info.keyframe_interval:
+            print(f"   Keyframe interval: {self.video_info.keyframe_interval:g} frames")
+        print(f"   Detector: {detector_type}")
+        print(f"   Threshold: {threshold}")
+        print(f"   Min scene length: {min_scene_len}s")
+        if profile != 'full' or settings != DETECTION_PROFILES['full']:
+            print(f"   Profile: {profile} (downscale: {settings['downscale'] or 'auto'}, frame stride: {settings['frame_stride']})")
+        if keyframes_only:
+            print(f"   Mode: keyframes only")
+        elif bisect:
+            print(f"   Mode: bisection (keyframes, or samples every {sample_interval}s)")
+        elif two_pass:
+            print(f"   Mode: two-pass (coarse stride: {coarse_stride}, coarse width: {coarse_width}px)")
+        elif audio_guided:
+            print(f"   Mode: audio-guided (pause level: {pause_db} dB, margin: {pause_margin}s)")
+        elif backend != 'opencv':
+            print(f"   Backend: {backend}")
+        if detector_type == 'slides':
+            print(f"   ROI: {'x={}, y={}, w={}, h={}'.format(*roi) if roi else 'full frame'}, "
+                  f"excluded regions: {len(exclude or [])}, hysteresis: {hysteresis} frames")
+        if jobs > 1 and detector_type in ('content', 'adaptive') and backend == 'opencv':
+            print(f"   Jobs: {jobs}")
+        
+        min_scene_frames = self._min_scene_frames(min_scene_len, fps)
+        
+        # Frames are only scored by modes that decode all of them in-process
+        full_scan = (detector_type != 'ffmpeg-scene'
+                     and not keyframes_only and not bisect and not two_pass and not audio_guided)
+        self.frame_quality = FrameQualityTracker() if score_frames and full_scan else None
+        if score_frames:
+            print(f"   Frame scoring: {'on' if self.frame_quality else 'not available in this mode, best frames fall back to middle'}")
+        
+        # Cached metrics are only valid for the default full-rate analysis
+        use_stats_cache = (use_stats_cache and detector_type in ('content', 'adaptive', 'numpy')
+                           and settings == DETECTION_PROFILES['full']
+                           and backend == 'opencv' and not luma_only
+                           and not keyframes_only and not bisect and not two_pass and not audio_guided)
+        # Cached metrics skip decoding, so there would be no frames to score
+        scores = self._load_stats() if use_stats_cache and not self.frame_quality else None
+        
+        if scores is not None:
+            # Recompute cuts from cached metrics without decoding the video
+            print(f"   Using cached frame stats: {self.stats_file.name}")
+            cuts = _cuts_from_scores(detector_type, threshold, min_scene_frames, scores)
+            scene_list = self._build_scene_list(cuts, fps, len(scores))
+        elif keyframes_only:
+            scene_list = self._detect_scenes_keyframes(
+                threshold, min_scene_frames, fps, frame_count, settings['downscale'], luma_only
+            )
+        elif bisect:
+            scene_list = self._detect_scenes_bisect(
+                threshold, min_scene_frames, fps, frame_count, settings['downscale'], sample_interval
+            )
+        elif audio_guided:
+            scene_list = self._detect_scenes_audio(
+                threshold, min_scene_frames, fps, frame_count, settings['downscale'],
+                pause_db, pause_margin, audio_recall
+            )
+        elif two_pass:
+            scene_list = self._detect_scenes_two_pass(
+                threshold, min_scene_frames, fps, frame_count, settings['downscale'],
+                coarse_stride, coarse_width, backend
+            )
+        elif detector_type == 'slides':
+            scene_list = self._detect_scenes_slides(
+                threshold, min_scene_frames, fps, frame_count, settings['downscale'],
+                settings['frame_stride'], backend, roi, exclude, hysteresis, self.frame_quality
+            )
+        elif detector_type == 'ffmpeg-scene':
+            scene_list = self._detect_scenes_ffmpeg(
+                threshold, min_scene_frames, fps, frame_count, settings['downscale']
+            )
+        elif detector_type == 'numpy' or backend != 'opencv':
+            scene_list = self._detect_scenes_frames(
+                detector_type, threshold, min_scene_frames, fps, frame_count,
+                settings['downscale'], settings['frame_stride'], backend, luma_only,
+                quality=self.frame_quality
+            )
+        elif jobs > 1:
+            scene_list = self._detect_scenes_sharded(
+                detector_type, threshold, min_scene_frames, fps, frame_count, jobs,
+                settings['downscale'], settings['frame_stride'], luma_only, self.frame_quality
+            )
+        else:
+            # Detect scenes
+            detector = _create_detector(detector_type, threshold, min_scene_frames, luma_only)
+            scene_list = _run_scene_manager(
+                str(self.video_path),
+                detector,
+                settings['downscale'],
+                settings['frame_stride'],
+                stats_file_path=str(self.stats_file) if use_stats_cache else None,
+                quality=self.frame_quality
+            )
+        
+        return self._set_scene_list(scene_list)
+    
+    def split_equal(self, parts: int) -> List[Tuple[FrameTimecode, FrameTimecode]]:
+        """
+        Split video into equal parts without decoding it
+        
+        Part boundaries come from the container duration and are moved to the
+        nearest keyframe within half a part, so stream-copied clips start
+        exactly at them.
+        
+        :param parts: Number of parts
+        :return: List of parts with timestamps
+        """
+        if parts < 1:
+            raise ValueError(f"Number of parts must be positive: {parts}")
+        
+        fps = self.video_info.fps
+        frame_count = self.video_info.frame_count
+        part_len = frame_count / parts
+        
+        print(f"🔪 Splitting video into {parts} equal parts: {self.video_path.name}")
+        print(f"   Duration: {self.video_info.duration:.2f}s")
+        print(f"   Part length: {part_len / fps if fps > 0 else 0:.2f}s")
+        
+        keyframes = self.keyframe_index
+        self.frame_quality = None
+        cuts = []
+        snapped = 0
+        for i in range(1, parts):
+            cut = round(i * part_len)
+            if keyframes:
+                k = keyframes.preceding(cut)
+                # Nearest of the keyframes around the exact boundary
+                nearest = min(keyframes.frames[k:k + 2], key=lambda frame: abs(int(frame) - cut))
+                if abs(int(nearest) - cut) <= part_len / 2:
+                    cut = int(nearest)
+                    snapped += 1
+            if (not cuts or cut > cuts[-1]) and 0 < cut < frame_count:
+                cuts.append(cut)
+        
+        if not keyframes:
+            print("   ⚠️  No keyframe index, boundaries are not aligned to keyframes")
+        elif parts > 1:
+            print(f"   Boundaries on keyframes: {snapped} of {parts - 1}")
+        
+        if cuts:
+            scene_list = self._build_scene_list(cuts, fps, frame_count)
+        else:
+            scene_list = [(scenedetect.FrameTimecode(0, fps=fps), scenedetect.FrameTimecode(frame_count, fps=fps))]
+        return self._set_scene_list(scene_list)
+    
+    def _set_scene_list(self, scene_list: List[Tuple[FrameTimecode, FrameTimecode]]) -> List[Tuple[FrameTimecode, FrameTimecode]]:
+        """
+        Print detected scenes and store them for extraction
+        
+        :param scene_list: List of scenes with timestamps
+        :return: The same list (empty if nothing was detected)
+        """
+        if not scene_list:
+            print("⚠️  No scenes detected")
+            return []
+        
+        print(f"\n✅ Found scenes: {len(scene_list)}")
+        
+        # Display scene information
+        for i, (start, end) in enumerate(scene_list, 1):
+            start_time = start.get_seconds()
+            end_time = end.get_seconds()
+            scene_duration = end_time - start_time
+            
+            print(f"   Scene {i:03d}: {self._format_time(start_time)} - {self._format_time(end_time)} (duration: {scene_duration:.2f}s)")
+        
+        self.scene_list = scene_list
+        self.frame_records = {}
+        return scene_list
+    
+    def detect_scenes_stream(self,
+                             threshold: float = 30.0,
+                             min_scene_len: float = 0.5,
+                             detector_type: str = 'content',
+                             profile: str = 'full',
+                             downscale: Optional[int] = None,
+                             frame_stride: Optional[int] = None,
+                             luma_only: bool = False,
+                             remux_path: Optional[str] = None,
+                             score_frames: bool = False) -> List[Tuple[FrameTimecode, FrameTimecode]]:
+        """
+        Detect scenes while the HLS stream is downloading
+        
+        A single ffmpeg process reads the stream and tees it: low-resolution
+        frames go to the detector through a pipe as segments arrive, and if
+        remux_path is set the same packets are copied into an MP4 file. The
+        MP4 is never written otherwise, so frames and clips can only be
+        extracted when it is.
+        
+        :param threshold: Sensitivity threshold (1-100, lower = more scenes)
+        :param min_scene_len: Minimum scene length in seconds
+        :param detector_type: Detector type ('content', 'adaptive' or 'numpy')
+        :param profile: Detection profile ('full' or 'fast')
+        :param downscale: Downscale factor, overrides the profile (0 = automatic)
+        :param frame_stride: Analyse every Nth frame, overrides the profile
+        :param luma_only: Compare only brightness of frames
+        :param remux_path: Path for a copy of the stream as MP4 (None = don't write)
+        :param score_frames: Score sharpness and stability of analysed frames for 'best' frame extraction
+        :return: List of scenes with timestamps
+        """
+        if not self.source:
+            raise ValueError(f"Not a stream source: {self.video_path}")
+        if detector_type not in ('content', 'adaptive', 'numpy'):
+            raise ValueError(f"Detector '{detector_type}' is not supported for streams")
+        
+        # Stream properties from the playlist and its first segment
+        cap = cv2.VideoCapture(self.source)
+        fps = cap.get(cv2.CAP_PROP_FPS)
+        width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+        height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        cap.release()
+        if fps <= 0 or width <= 0:
+            raise RuntimeError(f"Can't read video stream: {self.source}")
+        
+        settings = self._profile_settings(profile, downscale, frame_stride)
+        frame_downscale = settings['downscale'] or sd_scene_manager.compute_downscale_factor(width)
+        size = (round(width / frame_downscale), round(height / frame_downscale))
+        
+        print(f"🔍 Analyzing stream: {self.source}")
+        print(f"   Resolution: {width}x{height}, analysed at {size[0]}x{size[1]}")
+        print(f"   FPS: {fps:.2f}")
+        print(f"   Detector: {detector_type}")
+        print(f"   Threshold: {threshold}")
+        print(f"   Min scene length: {min_scene_len}s")
+        print(f"   MP4 copy: {remux_path or 'not written'}")
+        
+        gray = luma_only and detector_type == 'numpy'
+        batch = np.empty((64, size[1], size[0]) if gray else (64, size[1], size[0], 3), dtype=np.uint8)
+        batches = self._iter_frame_batches_ffmpeg(
+            batch, settings['frame_stride'], gray, fps=fps, source=self.source, remux_path=remux_path
+        )
+        
+        self.frame_quality = FrameQualityTracker() if score_frames else None
+        
+        start_time = time.time()
+        scene_list = self._detect_scenes_frames(
+            detector_type, threshold, self._min_scene_frames(min_scene_len, fps), fps, 0,
+            frame_stride=settings['frame_stride'], luma_only=luma_only, batches=batches,
+            quality=self.frame_quality
+        )
+        print(f"   Download and detection: {time.time() - start_time:.1f}s")
+        
+        if remux_path:
+            if Path(remux_path).exists() and Path(remux_path).stat().st_size > 0:
+                self.video_path = Path(remux_path)
+                print(f"   MP4 saved: {remux_path} ({self.video_path.stat().st_size / (1024 * 1024):.2f} MB)")
+            else:
+                print(f"   ⚠️  MP4 copy was not written: {remux_path}")
+        
+        return self._set_scene_list(scene_list)
+    
+    def iter_scenes(self,
+                    threshold: float = 30.0,
+                    min_scene_len: float = 0.5,
+                    detector_type: str = 'content',
+                    profile: str = 'full',
+                    downscale: Optional[int] = None,
+                    frame_stride: Optional[int] = None,
+                    luma_only: bool = False,
+                    score_frames: bool = False,
+                    jobs: int = 1,
+                    use_stats_cache: bool = True,
+                    backend: str = 'opencv',
+                    keyframes_only: bool = False,
+                    bisect: bool = False,
+                    sample_interval: float = 2.0,
+                    two_pass: bool = False,
+                    coarse_stride: int = 10,
+                    coarse_width: int = 64,
+                    roi: Optional[Tuple[int, int, int, int]] = None,
+                    exclude: Optional[List[Tuple[int, int, int, int]]] = None,
+                    hysteresis: int = 3,
+                    audio_guided: bool = False,
+                    pause_db: float = -30.0,
+                    pause_margin: float = 0.5,
+                    audio_recall: bool = False) -> Iterator[Tuple[int, FrameTimecode, FrameTimecode]]:
+        """
+        Detect scenes and yield each one as soon as its end cut is confirmed
+        
+        Detection runs in a background thread, so the consumer can extract
+        frames and clips of finished scenes while the rest of the video is
+        scanned. Every scene is also appended to scenes_metadata.jsonl
+        before it is yielded, which keeps partial results if the run dies.
+        Other detectors, and modes that don't scan every frame in-process,
+        run detect_scenes with all options first and then yield its scenes.
+        
+        :param threshold: Sensitivity threshold (1-100, lower = more scenes)
+        :param min_scene_len: Minimum scene length in seconds
+        :param detector_type: Detector type ('content' and 'adaptive' are streamed)
+        :param profile: Detection profile ('full' or 'fast')
+        :param downscale: Downscale factor, overrides the profile (0 = automatic)
+        :param frame_stride: Analyse every Nth frame, overrides the profile
+        :param luma_only: Compare only brightness of frames
+        :param score_frames: Score sharpness and stability of analysed frames for 'best' frame extraction
+        :param jobs: Number of parallel processes (not streamed)
+        :param use_stats_cache: Save per-frame metrics and reuse them on later runs (not streamed)
+        :param backend: Frame decoding backend ('ffmpeg-pipe' is not streamed)
+        :param keyframes_only: Decode and compare only keyframes (not streamed)
+        :param bisect: Compare keyframes or sparse samples and search differing intervals for cuts (not streamed)
+        :param sample_interval: Seconds between samples in bisect mode
+        :param two_pass: Find candidate windows in a coarse pass, place cuts in a full-rate pass (not streamed)
+        :param coarse_stride: Analyse every Nth frame in the coarse pass
+        :param coarse_width: Frame width in pixels for the coarse pass
+        :param roi: Region (x, y, w, h) in pixels analysed by the slides detector
+        :param exclude: Regions (x, y, w, h) in pixels ignored by the slides detector
+        :param hysteresis: Analysed frames a slide change must persist (slides detector)
+        :param audio_guided: Examine only frames around pauses in the audio track (not streamed)
+        :param pause_db: Level below which audio counts as a pause, in dB relative to speech
+        :param pause_margin: Seconds of video examined before and after each pause
+        :param audio_recall: Compare audio-guided cuts with a full run
+        :return: Iterator of (scene number, start, end)
+        """
+        self.scene_list = []
+        self.frame_records = {}
+        self.metadata_stream_file.unlink(missing_ok=True)
+        
+        conflicts = _stream_conflicts(jobs, backend, keyframes_only, bisect, two_pass, audio_guided)
+        if detector_type not in ('content', 'adaptive') or conflicts:
+            if conflicts and detector_type in ('content', 'adaptive'):
+                print(f"⚠️  {', '.join(conflicts)} can't be streamed, scenes are yielded after detection")
+            scene_list = self.detect_scenes(
+                threshold, min_scene_len, detector_type, profile=profile,
+                downscale=downscale, frame_stride=frame_stride, luma_only=luma_only,
+                score_frames=score_frames, jobs=jobs, use_stats_cache=use_stats_cache,
+                backend=backend, keyframes_only=keyframes_only, bisect=bisect,
+                sample_interval=sample_interval, two_pass=two_pass,
+                coarse_stride=coarse_stride, coarse_width=coarse_width,
+                roi=roi, exclude=exclude, hysteresis=hysteresis,
+                audio_guided=audio_guided, pause_db=pause_db, pause_margin=pause_margin,
+                audio_recall=audio_recall
+            )
+            for i, (start, end) in enumerate(scene_list, 1):
+                self._append_scene_info(i, start, end)
+                yield i, start, end
+            return
+        
+        settings = self._profile_settings(profile, downscale, frame_stride)
+        
+        video = scenedetect.open_video(str(self.video_path))
+        fps = video.frame_rate
+        min_scene_frames = self._min_scene_frames(min_scene_len, fps)
+        
+        print(f"🔍 Streaming scenes: {self.video_path.name}")
+        print(f"   Detector: {detector_type}")
+        print(f"   Threshold: {threshold}")
+        print(f"   Min scene length: {min_scene_len}s")
+        
+        scene_manager = scenedetect.SceneManager()
+        if settings['downscale']:
+            scene_manager.auto_downscale = False
+            scene_manager.downscale = settings['downscale']
+        # Frames of a scene are all scored before its end cut is reported
+        self.frame_quality = FrameQualityTracker() if score_frames else None
+        if self.frame_quality:
+            scene_manager.add_detector(_create_quality_detector(self.frame_quality))
+        scene_manager.add_detector(_create_detector(detector_type, threshold, min_scene_frames, luma_only))
+        
+        cuts = queue.Queue()
+        errors = []
+        
+        def detect():
+            try:
+                scene_manager.detect_scenes(
+                    video=video,
+                    frame_skip=settings['frame_stride'] - 1,
+                    callback=lambda frame_img, frame_num: cuts.put(frame_num)
+                )
+            except Exception as e:
+                errors.append(e)
+            finally:
+                cuts.put(None)
+        
+        worker = threading.Thread(target=detect, daemon=True)
+        worker.start()
+        
+        scene_number = 0
+        scene_start = 0
+        try:
+            while True:
+                cut = cuts.get()
+                if cut is None:
+                    break
+                if cut <= scene_start:
+                    continue
+                scene_number += 1
+                yield self._stream_scene(scene_number, scene_start, cut, fps)
+                scene_start = cut
+            
+            worker.join()
+            if errors:
+                raise errors[0]
+            
+            # Cuts confirmed by post-processing at the end don't go through the callback
+            for start, _ in scene_manager.get_scene_list()[1:]:
+                if start.get_frames() > scene_start:
+                    scene_number += 1
+                    yield self._stream_scene(scene_number, scene_start, start.get_frames(), fps)
+                    scene_start = start.get_frames()
+            
+            if scene_number:
+                yield self._stream_scene(scene_number + 1, scene_start, video.frame_number, fps)
+        finally:
+            # Consumer stopped early
+            scene_manager.stop()
+            worker.join()
+    
+    def _stream_scene(self,
+                      scene_number: int,
+                      start_frame: int,
+                      end_frame: int,
+                      fps: float) -> Tuple[int, FrameTimecode, FrameTimecode]:
+        """
+        Record a streamed scene in scene_list and scenes_metadata.jsonl
+        
+        :param scene_number: Scene number (from 1)
+        :param start_frame: First frame of the scene
+        :param end_frame: Frame after the last one of the scene
+        :param fps: Video FPS
+        :return: Tuple (scene number, start, end)
+        """
+        start = scenedetect.FrameTimecode(start_frame, fps=fps)
+        end = scenedetect.FrameTimecode(end_frame, fps=fps)
+        self.scene_list.append((start, end))
+        self._append_scene_info(scene_number, start, end)
+        return scene_number, start, end
+    
+    def _append_scene_info(self, scene_number: int, start: FrameTimecode, end: FrameTimecode):
+        """Append scene metadata as one JSON line and flush it to disk"""
+        with open(self.metadata_stream_file, 'a') as f:
+            f.write(json.dumps(self._scene_info(scene_number, start, end)) + "\n")
+    
+    def _detect_scenes_frames(self,
+                              detector_type: str,
+                              threshold: float,
+                              min_scene_frames: int,
+                              fps: float,
+                              frame_count: int,
+                              downscale: int = 0,
+                              frame_stride: int = 1,
+                              backend: str = 'opencv',
+                              luma_only: bool = False,
+                              batches: Optional[Iterator[Tuple[List[int], 'np.ndarray']]] = None,
+                              quality: Optional[FrameQualityTracker] = None) -> List[Tuple[FrameTimecode, FrameTimecode]]:
+        """
+        Detect scenes by feeding decoded frame batches to a detector
+        
+        The NumPy detector consumes whole batches, PySceneDetect detectors
+        get the frames one by one.
+        
+        :param detector_type: Detector type ('content', 'adaptive' or 'numpy')
+        :param threshold: Sensitivity threshold
+        :param min_scene_frames: Minimum scene length in frames
+        :param fps: Video FPS
+        :param frame_count: Total number of frames
+        :param downscale: Downscale factor (0 = automatic)
+        :param frame_stride: Analyse every Nth frame
+        :param backend: Frame decoding backend ('opencv' or 'ffmpeg-pipe')
+        :param luma_only: Compare only brightness of frames
+        :param batches: Frame batches to use instead of decoding the video file
+        :param quality: Tracker scoring the analysed frames for best frame selection
+        :return: List of scenes with timestamps
+        """
+        if detector_type == 'numpy':
+            detector = BatchContentDetector(threshold, min_scene_frames)
+        else:
+            detector = _create_detector(detector_type, threshold, min_scene_frames, luma_only)
+        
+        # PySceneDetect detectors always need color frames
+        gray = luma_only and detector_type == 'numpy'
+        
+        start_time = time.time()
+        cuts = []
+        last_frame_num = -1
+        
+        if batches is None:
+            batches = self._iter_frame_batches(downscale, frame_stride, backend=backend, gray=gray)
+        
+        for frame_nums, frames in batches:
+            if detector_type == 'numpy':
+                detector.process_batch(frame_nums, frames)
+            else:
+                for frame_num, frame in zip(frame_nums, frames):
+                    cuts += detector.process_frame(frame_num, frame)
+            if quality:
+                quality.process_batch(frame_nums, frames)
+            last_frame_num = frame_nums[-1]
+        
+        elapsed_time = time.time() - start_time
+        
+        if detector_type == 'numpy':
+            cuts = detector.get_cuts()
+        elif last_frame_num >= 0:
+            cuts = sorted(set(cuts + detector.post_process(last_frame_num)))
+        
+        # Frames after the last analysed one are still part of the video
+        frames_read = max(last_frame_num + 1, min(frame_count, last_frame_num + frame_stride))
+        
+        if elapsed_time > 0:
+            print(f"   Detection speed: {frames_read / elapsed_time:.1f} frames/s")
+        
+        return self._build_scene_list(cuts, fps, frames_read)
+    
+    def _detect_scenes_slides(self,
+                              threshold: float,
+                              min_scene_frames: int,
+                              fps: float,
+                              frame_count: int,
+                              downscale: int = 0,
+                              frame_stride: int = 1,
+                              backend: str = 'opencv',
+                              roi: Optional[Tuple[int, int, int, int]] = None,
+                              exclude: Optional[List[Tuple[int, int, int, int]]] = None,
+                              hysteresis: int = 3,
+                              quality: Optional[FrameQualityTracker] = None) -> List[Tuple[FrameTimecode, FrameTimecode]]:
+        """
+        Detect slide changes on downscaled grayscale frames cropped to the ROI
+        
+        :param threshold: Mean absolute luma difference that counts as a change
+        :param min_scene_frames: Minimum scene length in frames
+        :param fps: Video FPS
+        :param frame_count: Total number of frames
+        :param downscale: Downscale factor (0 = automatic)
+        :param frame_stride: Analyse every Nth frame
+        :param backend: Frame decoding backend ('opencv' or 'ffmpeg-pipe')
+        :param roi: Region (x, y, w, h) in pixels to analyse (default: full frame)
+        :param exclude: Regions (x, y, w, h) in pixels to ignore
+        :param hysteresis: Analysed frames a change must persist before a cut
+        :param quality: Tracker scoring the analysed frames (ROI, excluded areas blanked)
+        :return: List of scenes with timestamps
+        """
+        width = self.video_info.width
+        height = self.video_info.height
+        
+        if roi:
+            x, y, roi_width, roi_height = roi
+            roi_width = min(roi_width, width - x)
+            roi_height = min(roi_height, height - y)
+            if roi_width <= 0 or roi_height <= 0:
+                raise ValueError(f"ROI {roi} is outside the {width}x{height} frame")
+            roi = (x, y, roi_width, roi_height)
+        else:
+            roi = (0, 0, width, height)
+        
+        downscale = downscale or sd_scene_manager.compute_downscale_factor(width)
+        
+        # Exclusions relative to the cropped and downscaled frame
+        scaled_exclude = []
+        for x, y, exclude_width, exclude_height in exclude or []:
+            left = max(0, x - roi[0]) // downscale
+            top = max(0, y - roi[1]) // downscale
+            right = -(-max(0, x + exclude_width - roi[0]) // downscale)
+            bottom = -(-max(0, y + exclude_height - roi[1]) // downscale)
+            if right > left and bottom > top:
+                scaled_exclude.append((left, top, right - left, bottom - top))
+        
+        detector = SlideDetector(threshold, min_scene_frames, hysteresis, scaled_exclude)
+        
+        start_time = time.time()
+        last_frame_num = -1
+        
+        for frame_nums, frames in self._iter_frame_batches(downscale, frame_stride, backend=backend,
+                                                           gray=True, crop=roi):
+            detector.process_batch(frame_nums, frames)
+            if quality:
+                quality.process_batch(frame_nums, frames)
+            last_frame_num = frame_nums[-1]
+        
+        elapsed_time = time.time() - start_time
+        
+        frames_read = max(last_frame_num + 1, min(frame_count, last_frame_num + frame_stride))
+        
+        print(f"   Analysed area: {roi[2] * roi[3] / (width * height) * 100:.0f}% of the frame")
+        if elapsed_time > 0:
+            print(f"   Detection speed: {frames_read / elapsed_time:.1f} frames/s")
+        
+        return self._build_scene_list(detector.get_cuts(), fps, frames_read)
+    
+    def _detect_scenes_bisect(self,
+                              threshold: float,
+                              min_scene_frames: int,
+                              fps: float,
+                              frame_count: int,
+                              downscale: int = 0,
+                              sample_interval: float = 2.0) -> List[Tuple[FrameTimecode, FrameTimecode]]:
+        """
+        Detect scenes by sparse sampling and a forward search between samples
+        
+        With a keyframe index the samples are the keyframes, which ffmpeg
+        decodes alone. When keyframes are unknown, or so dense that seeking to
+        a frame every sample_interval seconds decodes less, those frames are
+        the samples instead. When two neighbouring samples differ past the
+        threshold, the frames between them are decoded forward from the first
+        one (inside a GOP that is the only way to reach them, so bisecting
+        would decode the same frames and seek back on top) and adjacent
+        frames that differ past the threshold are cuts. The search stops at
+        the first frame that matches the next sample, so a GOP is decoded
+        only up to its last cut. Slow motion and fades have no such adjacent
+        frames and are not reported. A change that is reverted before the
+        next sample is not seen.
+        
+        :param threshold: Sensitivity threshold (ContentDetector scale)
+        :param min_scene_frames: Minimum scene length in frames
+        :param fps: Video FPS
+        :param frame_count: Total number of frames
+        :param downscale: Downscale factor (0 = automatic)
+        :param sample_interval: Seconds between samples without usable keyframes
+        :return: List of scenes with timestamps
+        """
+        if frame_count <= 0:
+            # The probe found neither a frame count nor a duration
+            print("⚠️  Frame count unknown, bisection needs it to place samples")
+            return []
+        
+        step = max(1, round(sample_interval * fps))
+        keyframes = self.keyframe_index
+        keyframe_samples = False
+        if keyframes is not None and len(keyframes) > 1 and shutil.which("ffmpeg"):
+            # Decoding every keyframe against an OpenCV seek per sample (half a GOP and the backoff)
+            gop = frame_count / len(keyframes)
+            keyframe_samples = len(keyframes) <= frame_count / step * (gop / 2 + FrameReader.SEEK_BACKOFF)
+        cuts = []
+        
+        start_time = time.time()
+        if keyframe_samples:
+            reader = self._keyframe_reader(downscale)
+            samples = self._iter_keyframe_samples(downscale)
+        else:
+            # Many short seeks: OpenCV's in-process ones beat an ffmpeg start each
+            reader = FrameReader(self.video_path, downscale, keyframes=keyframes)
+            positions = list(range(0, frame_count, step))
+            if positions[-1] != frame_count - 1:
+                positions.append(frame_count - 1)
+            samples = ((position, reader.read(position)) for position in positions)
+        
+        sampled = 0
+        try:
+            low, low_frame = None, None
+            for high, high_frame in samples:
+                if high_frame is None:
+                    break
+                sampled += 1
+                # Keyframe samples are views into a reused batch array
+                high_frame = high_frame.copy() if keyframe_samples else high_frame
+                
+                if low_frame is not None and _content_score(low_frame, high_frame) >= threshold:
+                    for cut in self._search_cuts(reader, low, low_frame, high, high_frame, threshold):
+                        if not cuts or cut - cuts[-1] >= min_scene_frames:
+                            cuts.append(cut)
+                
+                low, low_frame = high, high_frame
+        finally:
+            samples.close()
+            reader.release()
+        elapsed_time = time.time() - start_time
+        
+        # Keyframe samples come from their own ffmpeg pass
+        decoded = reader.decoded + (sampled if keyframe_samples else 0)
+        print(f"   Samples: {sampled} {'keyframes' if keyframe_samples else f'frames every {sample_interval:g}s'}")
+        print(f"   Frames decoded: {decoded} of {frame_count}"
+              f" ({decoded / frame_count * 100:.1f}%), seeks: {reader.seeks}")
+        if elapsed_time > 0:
+            print(f"   Detection speed: {frame_count / elapsed_time:.1f} frames/s")
+        
+        return self._build_scene_list(cuts, fps, frame_count)
+    
+    def _iter_keyframe_samples(self, downscale: int = 0) -> Iterator[Tuple[int, 'np.ndarray']]:
+        """
+        Decode keyframes only, numbered from the keyframe index
+        
+        The frames are views into a reused batch array.
+        
+        :param downscale: Downscale factor (0 = automatic)
+        :return: Iterator of (frame number, frame)
+        """
+        keyframes = self.keyframe_index
+        # showinfo timestamps are rounded to frames, the nearest indexed keyframe is the one
+        keyframe_nums = np.round(keyframes.pts * self.video_info.fps)
+        for frame_nums, frames in self._iter_frame_batches(downscale, backend='ffmpeg-pipe', keyframes_only=True):
+            for frame_num, frame in zip(frame_nums, frames):
+                yield int(keyframes.frames[np.abs(keyframe_nums - frame_num).argmin()]), frame
+    
+    def _search_cuts(self,
+                     reader: 'FrameReader',
+                     low: int,
+                     low_frame: 'np.ndarray',
+                     high: int,
+                     high_frame: 'np.ndarray',
+                     threshold: float) -> List[int]:
+        """
+        Find cut frames between two differing samples, decoding forward from the first one
+        
+        :param reader: Frame reader (FrameReader or KeyframeReader)
+        :param low: First sample frame number
+        :param low_frame: First sample frame
+        :param high: Next sample frame number
+        :param high_frame: Next sample frame
+        :param threshold: Sensitivity threshold
+        :return: Frame numbers of the first frames of new scenes
+        """
+        cuts = []
+        previous_frame = low_frame
+        for frame_num in range(low + 1, high):
+            frame = reader.read(frame_num)
+            if frame is None:
+                return cuts
+            if _content_score(previous_frame, frame) >= threshold:
+                cuts.append(frame_num)
+            if _content_score(frame, high_frame) < threshold:
+                # The rest up to the next sample looks like it
+                return cuts
+            previous_frame = frame
+        
+        if _content_score(previous_frame, high_frame) >= threshold:
+            cuts.append(high)
+        return cuts
+    
+    def _keyframe_reader(self, downscale: int = 0) -> 'FrameReader':
+        """
+        Frame reader for sparse decoding: from exact keyframes with an index and ffmpeg, OpenCV otherwise
+        
+        :param downscale: Downscale factor (0 = automatic)
+        :return: KeyframeReader or FrameReader
+        """
+        keyframes = self.keyframe_index
+        if keyframes is not None and len(keyframes) and shutil.which("ffmpeg"):
+            return KeyframeReader(self.video_path, keyframes, self.video_info.fps, downscale)
+        return FrameReader(self.video_path, downscale, keyframes=keyframes)
+    
+    def _detect_scenes_two_pass(self,
+                                threshold: float,
+                                min_scene_frames: int,
+                                fps: float,
+                                frame_count: int,
+                                downscale: int = 0,
+                                coarse_stride: int = 10,
+                                coarse_width: int = 64,
+                                backend: str = 'opencv') -> List[Tuple[FrameTimecode, FrameTimecode]]:
+        """
+        Detect scenes with a coarse pass and frame-accurate refinement
+        
+        The coarse pass compares every Nth frame at low resolution and marks
+        windows between samples that differ past COARSE_THRESHOLD_RATIO of
+        the threshold; it still decodes every frame, skipped ones are only
+        not converted and scored. The fine pass decodes only these windows
+        (from the keyframe before each, see KeyframeReader) at detection
+        resolution, scores adjacent frames and runs the usual ContentDetector
+        cut logic, so cuts stay on exact frames.
+        
+        :param threshold: Sensitivity threshold (ContentDetector scale)
+        :param min_scene_frames: Minimum scene length in frames
+        :param fps: Video FPS
+        :param frame_count: Total number of frames
+        :param downscale: Downscale factor for the fine pass (0 = automatic)
+        :param coarse_stride: Analyse every Nth frame in the coarse pass
+        :param coarse_width: Frame width in pixels for the coarse pass
+        :param backend: Frame decoding backend for the coarse pass
+        :return: List of scenes with timestamps
+        """
+        width = self.video_info.width
+        
+        coarse_stride = max(1, coarse_stride)
+        coarse_downscale = max(1, round(width / max(1, coarse_width)))
+        
+        # Pass 1: candidate windows
+        start_time = time.time()
+        coarse = BatchContentDetector(threshold, min_scene_frames)
+        for frame_nums, frames in self._iter_frame_batches(coarse_downscale, coarse_stride, backend=backend):
+            coarse.process_batch(frame_nums, frames)
+        coarse_time = time.time() - start_time
+        
+        windows = []
+        for previous, current, score in zip(coarse.frame_nums, coarse.frame_nums[1:], coarse.scores[1:]):
+            if score >= threshold * COARSE_THRESHOLD_RATIO:
+                if windows and windows[-1][1] == previous:
+                    windows[-1] = (windows[-1][0], current)
+                else:
+                    windows.append((previous, current))
+        
+        # Last analysed frame may be followed by up to stride - 1 frames
+        if coarse.frame_nums and coarse.frame_nums[-1] < frame_count - 1:
+            windows.append((coarse.frame_nums[-1], frame_count - 1))
+        
+        # Pass 2: adjacent frame scores inside windows
+        start_time = time.time()
+        frame_nums, scores, decoded = self._score_windows(windows, downscale)
+        fine_time = time.time() - start_time
+        
+        cuts = _cuts_from_scores('content', threshold, min_scene_frames, scores, frame_nums)
+        
+        # Skipped frames are still decoded in the coarse pass, only not analysed
+        coarse_decoded = coarse.frame_nums[-1] + 1 if coarse.frame_nums else 0
+        print(f"   Coarse pass: {len(coarse.frame_nums)} of {coarse_decoded} decoded frames analysed "
+              f"in {coarse_time:.1f}s, {len(windows)} candidate windows")
+        print(f"   Fine pass: {decoded} frames decoded in {fine_time:.1f}s")
+        print(f"   Frames decoded: {coarse_decoded + decoded} of {frame_count}"
+              f" ({(coarse_decoded + decoded) / frame_count * 100 if frame_count else 0:.1f}%)")
+        
+        return self._build_scene_list(cuts, fps, frame_count)
+    
+    def _detect_scenes_audio(self,
+                             threshold: float,
+                             min_scene_frames: int,
+                             fps: float,
+                             frame_count: int,
+                             downscale: int = 0,
+                             pause_db: float = -30.0,
+                             pause_margin: float = 0.5,
+                             audio_recall: bool = False) -> List[Tuple[FrameTimecode, FrameTimecode]]:
+        """
+        Detect scenes only around pauses in the audio track
+        
+        Slide changes in lectures land in speech pauses. The audio is decoded
+        into windowed RMS, windows quieter than pause_db below the speech
+        level (90th percentile) that last at least AUDIO_MIN_PAUSE are
+        pauses, and only frames within pause_margin of a pause are decoded
+        and scored with ContentDetector logic.
+        
+        :param threshold: Sensitivity threshold (ContentDetector scale)
+        :param min_scene_frames: Minimum scene length in frames
+        :param fps: Video FPS
+        :param frame_count: Total number of frames
+        :param downscale: Downscale factor (0 = automatic)
+        :param pause_db: Pause level in dB relative to speech
+        :param pause_margin: Seconds examined before and after each pause
+        :param audio_recall: Report recall against a full run
+        :return: List of scenes with timestamps
+        """
+        start_time = time.time()
+        rms = _audio_rms(self.video_path)
+        
+        if rms is None:
+            print("⚠️  No audio track, running full detection")
+            detector = _create_detector('content', threshold, min_scene_frames)
+            return _run_scene_manager(str(self.video_path), detector, downscale)
+        
+        # Runs of quiet windows long enough to be pauses
+        quiet = rms < np.percentile(rms, 90) * 10 ** (pause_db / 20)
+        edges = np.diff(np.concatenate(([0], quiet.astype(np.int8), [0])))
+        min_windows = int(np.ceil(AUDIO_MIN_PAUSE / AUDIO_WINDOW))
+        pauses = [
+            (start * AUDIO_WINDOW, end * AUDIO_WINDOW)
+            for start, end in zip(np.flatnonzero(edges == 1), np.flatnonzero(edges == -1))
+            if end - start >= min_windows
+        ]
+        audio_time = time.time() - start_time
+        
+        print(f"   Audio pass: {len(pauses)} pauses in {audio_time:.1f}s")
+        if not pauses:
+            # Continuous audio: there is nothing to narrow the video pass down to
+            print(f"   ⚠️  No pauses found (try a higher --pause-db), running full detection")
+            detector = _create_detector('content', threshold, min_scene_frames)
+            return _run_scene_manager(str(self.video_path), detector, downscale)
+        
+        # Frame windows around pauses, merged when they overlap
+        windows = []
+        for pause_start, pause_end in pauses:
+            first = max(0, int((pause_start - pause_margin) * fps))
+            last = min(frame_count - 1, int(np.ceil((pause_end + pause_margin) * fps)))
+            if windows and first <= windows[-1][1]:
+                windows[-1] = (windows[-1][0], max(windows[-1][1], last))
+            elif first < last:
+                windows.append((first, last))
+        
+        start_time = time.time()
+        frame_nums, scores, decoded = self._score_windows(windows, downscale)
+        video_time = time.time() - start_time
+        
+        cuts = _cuts_from_scores('content', threshold, min_scene_frames, scores, frame_nums)
+        
+        print(f"   Video pass: {decoded} of {frame_count} frames in {video_time:.1f}s, "
+              f"{(1 - decoded / frame_count) * 100 if frame_count else 0:.1f}% skipped")
+        
+        if audio_recall:
+            self._report_recall(cuts, threshold, min_scene_frames, downscale)
+        
+        return self._build_scene_list(cuts, fps, frame_count)
+    
+    def _report_recall(self,
+                       cuts: List[int],
+                       threshold: float,
+                       min_scene_frames: int,
+                       downscale: int = 0,
+                       tolerance: int = 1):
+        """
+        Print recall of cuts against a full content detector run
+        
+        Cached frame stats are used when available, otherwise the full run
+        decodes the video once and writes the cache for later runs.
+        
+        :param cuts: Cuts to check
+        :param threshold: Sensitivity threshold
+        :param min_scene_frames: Minimum scene length in frames
+        :param downscale: Downscale factor for the full run (0 = automatic)
+        :param tolerance: Allowed difference in frames
+        """
+        scores = self._load_stats()
+        if scores is not None:
+            reference = _cuts_from_scores('content', threshold, min_scene_frames, scores)
+        else:
+            print("   Full run for recall...")
+            detector = _create_detector('content', threshold, min_scene_frames)
+            scene_list = _run_scene_manager(str(self.video_path), detector, downscale,
+                                            stats_file_path=str(self.stats_file))
+            reference = [start.get_frames() for start, _ in scene_list[1:]]
+        
+        found = sum(1 for cut in reference if any(abs(cut - other) <= tolerance for other in cuts))
+        extra = sum(1 for cut in cuts if not any(abs(cut - other) <= tolerance for other in reference))
+        recall = found / len(reference) * 100 if reference else 100.0
+        print(f"   Recall vs full run: {found}/{len(reference)} cuts ({recall:.1f}%), extra cuts: {extra}")
+    
+    def _score_windows(self,
+                       windows: List[Tuple[int, int]],
+                       downscale: int = 0) -> Tuple[List[int], List[float], int]:
+        """
+        Score adjacent frames inside frame windows, the rest of the video is not decoded
+        
+        Frames outside the windows get no score, which ContentDetector cut
+        logic treats as no change.
+        
+        :param windows: Sorted (first frame, last frame) windows
+        :param downscale: Downscale factor (0 = automatic)
+        :return: Tuple (frame numbers, content scores, number of decoded frames)
+        """
+        reader = self._keyframe_reader(downscale)
+        frame_nums = [0]
+        scores = [0.0]
+        try:
+            for window_start, window_end in windows:
+                previous_frame = reader.read(window_start)
+                for frame_num in range(window_start + 1, window_end + 1):
+                    frame = reader.read(frame_num)
+                    if previous_frame is None or frame is None:
+                        break
+                    frame_nums.append(frame_num)
+                    scores.append(_content_score(previous_frame, frame))
+                    previous_frame = frame
+        finally:
+            reader.release()
+        return frame_nums, scores, reader.decoded
+    
+    def _detect_scenes_ffmpeg(self,
+                              threshold: float,
+                              min_scene_frames: int,
+                              fps: float,
+                              frame_count: int,
+                              downscale: int = 0) -> List[Tuple[FrameTimecode, FrameTimecode]]:
+        """
+        Detect scenes with ffmpeg's scene change score
+        
+        Runs select='gt(scene,T)' with showinfo and parses cut timestamps from
+        the log, no frames are handled in Python. The threshold is given on
+        the same 1-100 scale as for other detectors (T = threshold / 100).
+        
+        :param threshold: Sensitivity threshold (1-100)
+        :param min_scene_frames: Minimum scene length in frames
+        :param fps: Video FPS
+        :param frame_count: Total number of frames
+        :param downscale: Downscale factor before scoring (0 = automatic)
+        :return: List of scenes with timestamps
+        """
+        if not shutil.which("ffmpeg"):
+            raise RuntimeError("FFmpeg not found, install FFmpeg to use the ffmpeg-scene detector")
+        
+        width = self.video_info.width
+        height = self.video_info.height
+        
+        downscale = downscale or sd_scene_manager.compute_downscale_factor(width)
+        
+        filters = []
+        if downscale > 1:
+            filters.append(f"scale={round(width / downscale)}:{round(height / downscale)}")
+        filters.append(f"select=gt(scene\\,{threshold / 100:.4f})")
+        filters.append("showinfo")
+        
+        cmd = [
+            "ffmpeg",
+            "-hide_banner",
+            "-nostats",
+            "-v", "info",
+            "-i", str(self.video_path),
+            "-an",
+            "-vf", ",".join(filters),
+            "-f", "null",
+            "-"
+        ]
+        
+        start_time = time.time()
+        result = subprocess.run(cmd, capture_output=True, text=True, errors='replace')
+        elapsed_time = time.time() - start_time
+        
+        if result.returncode != 0:
+            error_lines = result.stderr.strip().split('\n')[-5:]
+            raise RuntimeError("ffmpeg scene detection failed: " + " / ".join(error_lines))
+        
+        cuts = []
+        for line in result.stderr.splitlines():
+            match = SHOWINFO_PTS_RE.search(line)
+            if not match or 'Parsed_showinfo' not in line:
+                continue
+            
+            cut = round(float(match.group(1)) * fps)
+            # Keep min_scene_len between cuts
+            if cut <= 0 or (cuts and cut - cuts[-1] < min_scene_frames):
+                continue
+            cuts.append(cut)
+        
+        if elapsed_time > 0:
+            print(f"   Detection speed: {frame_count / elapsed_time:.1f} frames/s")
+        
+        return self._build_scene_list(cuts, fps, frame_count)
+    
+    def _detect_scenes_keyframes(self,
+                                 threshold: float,
+                                 min_scene_frames: int,
+                                 fps: float,
+                                 frame_count: int,
+                                 downscale: int = 0,
+                                 luma_only: bool = False) -> List[Tuple[FrameTimecode, FrameTimecode]]:
+        """
+        Detect scenes comparing consecutive keyframes only
+        
+        ffmpeg skips decoding of all non-key frames, consecutive keyframes are
+        compared with the NumPy content detector and cuts are placed on the
+        keyframe timestamps.
+        
+        :param threshold: Sensitivity threshold
+        :param min_scene_frames: Minimum scene length in frames
+        :param fps: Video FPS
+        :param frame_count: Total number of frames
+        :param downscale: Downscale factor (0 = automatic)
+        :param luma_only: Compare only brightness of frames
+        :return: List of scenes with timestamps
+        """
+        detector = BatchContentDetector(threshold, min_scene_frames)
+        
+        start_time = time.time()
+        for frame_nums, frames in self._iter_frame_batches(downscale, backend='ffmpeg-pipe',
+                                                           gray=luma_only, keyframes_only=True):
+            detector.process_batch(frame_nums, frames)
+        elapsed_time = time.time() - start_time
+        
+        keyframes = len(detector.frame_nums)
+        print(f"   Keyframes decoded: {keyframes} of {frame_count} frames"
+              f" ({keyframes / frame_count * 100 if frame_count else 0:.1f}%)")
+        if elapsed_time > 0:
+            print(f"   Detection speed: {frame_count / elapsed_time:.1f} frames/s")
+        
+        return self._build_scene_list(detector.get_cuts(), fps, frame_count)
+    
+    def _iter_frame_batches(self,
+                            downscale: int = 0,
+                            frame_stride: int = 1,
+                            batch_size: int = 64,
+                            backend: str = 'opencv',
+                            gray: bool = False,
+                            keyframes_only: bool = False,
+                            crop: Optional[Tuple[int, int, int, int]] = None) -> Iterator[Tuple[List[int], 'np.ndarray']]:
+        """
+        Decode downscaled frames into preallocated batch arrays
+        
+        The batch array is reused, so it must be consumed before the next
+        batch is requested.
+        
+        :param downscale: Downscale factor (0 = same as PySceneDetect's automatic one)
+        :param frame_stride: Keep every Nth frame (others are skipped)
+        :param batch_size: Frames per batch
+        :param backend: Frame decoding backend ('opencv' or 'ffmpeg-pipe')
+        :param gray: Decode luma only
+        :param keyframes_only: Decode only keyframes (ffmpeg-pipe backend)
+        :param crop: Region (x, y, w, h) in pixels to keep before downscaling
+        :return: Iterator of (frame numbers, frames array of shape (N, H, W, 3) or (N, H, W))
+        """
+        width = self.video_info.width
+        height = self.video_info.height
+        fps = self.video_info.fps
+        
+        downscale = downscale or sd_scene_manager.compute_downscale_factor(width)
+        if crop:
+            crop_x, crop_y, width, height = crop
+        size = (max(1, round(width / downscale)), max(1, round(height / downscale)))
+        
+        frame_shape = (size[1], size[0]) if gray else (size[1], size[0], 3)
+        batch = np.empty((batch_size,) + frame_shape, dtype=np.uint8)
+        
+        if backend == 'ffmpeg-pipe':
+            yield from self._iter_frame_batches_ffmpeg(batch, frame_stride, gray, keyframes_only, fps, crop)
+            return
+        
+        cap = cv2.VideoCapture(str(self.video_path))
+        frame_nums = []
+        frame_num = 0
+        
+        try:
+            while cap.grab():
+                if frame_num % frame_stride == 0:
+                    ret, frame = cap.retrieve()
+                    if not ret:
+                        break
+                    
+                    if crop:
+                        frame = frame[crop_y:crop_y + height, crop_x:crop_x + width]
+                    if frame.shape[1] != size[0] or frame.shape[0] != size[1]:
+                        frame = cv2.resize(frame, size, interpolation=cv2.INTER_LINEAR)
+                    if gray:
+                        cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY, dst=batch[len(frame_nums)])
+                    else:
+                        batch[len(frame_nums)] = frame
+                    frame_nums.append(frame_num)
+                    
+                    if len(frame_nums) == batch_size:
+                        yield frame_nums, batch
+                        frame_nums = []
+                frame_num += 1
+            
+            if frame_nums:
+                yield frame_nums, batch[:len(frame_nums)]
+        finally:
+            cap.release()
+    
+    def _iter_frame_batches_ffmpeg(self,
+                                   batch: 'np.ndarray',
+                                   frame_stride: int = 1,
+                                   gray: bool = False,
+                                   keyframes_only: bool = False,
+                                   fps: float = 0,
+                                   crop: Optional[Tuple[int, int, int, int]] = None,
+                                   source: Optional[str] = None,
+                                   remux_path: Optional[str] = None) -> Iterator[Tuple[List[int], 'np.ndarray']]:
+        """
+        Decode frames with ffmpeg and read rawvideo from its stdout into batch
+        
+        Frame selection, scaling and pixel format conversion run inside
+        ffmpeg; Python only copies fixed-size frames into the batch array.
+        In keyframes-only mode the decoder skips non-key frames and frame
+        numbers are taken from showinfo timestamps on ffmpeg's stderr.
+        
+        :param batch: Preallocated array of shape (N, H, W, 3) or (N, H, W)
+        :param frame_stride: Keep every Nth frame
+        :param gray: Output luma only
+        :param keyframes_only: Decode only keyframes
+        :param fps: Video FPS (converts keyframe timestamps to frame numbers)
+        :param crop: Region (x, y, w, h) in pixels to keep before scaling
+        :param source: Input to read instead of the video file (e.g. an m3u8 URL)
+        :param remux_path: Also copy the input into this MP4 file from the same process
+        :return: Iterator of (frame numbers, frames array)
+        """
+        if not shutil.which("ffmpeg"):
+            raise RuntimeError("FFmpeg not found, install FFmpeg to use the ffmpeg-pipe backend")
+        
+        batch_size, height, width = batch.shape[:3]
+        
+        filters = []
+        if frame_stride > 1 and not keyframes_only:
+            filters.append(f"select=not(mod(n\\,{frame_stride}))")
+        if crop:
+            filters.append("crop={2}:{3}:{0}:{1}".format(*crop))
+        filters.append(f"scale={width}:{height}")
+        if keyframes_only:
+            filters.append("showinfo")
+        
+        cmd = ["ffmpeg", "-hide_banner", "-nostats"]
+        if keyframes_only:
+            cmd.extend(["-v", "info", "-skip_frame", "nokey"])
+        else:
+            cmd.extend(["-v", "error"])
+        source = source or str(self.video_path)
+        if _is_stream_source(source):
+            cmd.extend(STREAM_INPUT_ARGS)
+        cmd.extend(["-i", source])
+        
+        if remux_path:
+            # Tee: stream copy into MP4 as a second output of the same process
+            cmd.extend(["-c", "copy", "-bsf:a", "aac_adtstoasc", "-y", str(remux_path)])
+        
+        cmd.extend([
+            "-an",
+            "-vf", ",".join(filters),
+            "-vsync", "passthrough",
+            "-f", "rawvideo",
+            "-pix_fmt", "gray" if gray else "bgr24",
+            "-"
+        ])
+        
+        process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        frame_size = batch[0].nbytes
+        frame_nums = []
+        frame_num = 0
+        
+        timestamps = None
+        errors = []
+        if keyframes_only:
+            # showinfo logs every frame before it is written to stdout
+            timestamps = queue.Queue()
+            reader = threading.Thread(
+                target=_read_showinfo, args=(process.stderr, timestamps, errors), daemon=True
+            )
+        else:
+            # Errors from corrupt input can fill the stderr pipe while stdout is read
+            reader = threading.Thread(target=_read_log, args=(process.stderr, errors), daemon=True)
+        reader.start()
+        
+        try:
+            while True:
+                if process.stdout.readinto(memoryview(batch[len(frame_nums)]).cast('B')) != frame_size:
+                    break
+                
+                if timestamps is not None:
+                    pts_time = timestamps.get()
+                    if pts_time is None:
+                        break
+                    frame_num = round(pts_time * fps)
+                
+                frame_nums.append(frame_num)
+                frame_num += frame_stride
+                
+                if len(frame_nums) == batch_size:
+                    yield frame_nums, batch
+                    frame_nums = []
+            
+            if frame_nums:
+                yield frame_nums, batch[:len(frame_nums)]
+        finally:
+            process.stdout.close()
+            if process.poll() is None:
+                process.kill()
+            reader.join()
+            process.wait()
+            stderr = "\n".join(errors)
+            if process.returncode not in (0, None, -9) and stderr:
+                print(f"   ffmpeg: {stderr.strip()}")
+    
+    def _profile_settings(self,
+                          profile: str,
+                          downscale: Optional[int] = None,
+                          frame_stride: Optional[int] = None) -> Dict[str, int]:
+        """Resolve detection profile settings with explicit overrides"""
+        if profile not in DETECTION_PROFILES:
+            raise ValueError(f"Unknown detection profile: {profile}")
+        
+        settings = dict(DETECTION_PROFILES[profile])
+        if downscale is not None:
+            settings['downscale'] = max(0, downscale)
+        if frame_stride is not None:
+            settings['frame_stride'] = max(1, frame_stride)
+        return settings
+    
+    def _min_scene_frames(self, min_scene_len: float, fps: float) -> int:
+        """Convert minimum scene length from seconds to frames using real FPS"""
+        return max(1, round(min_scene_len * fps)) if fps > 0 else max(1, round(min_scene_len * 30))
+    
+    def benchmark_profiles(self,
+                           threshold: float = 30.0,
+                           min_scene_len: float = 0.5,
+                           detector_type: str = 'content',
+                           profiles: Optional[List[str]] = None) -> Dict[str, Dict]:
+        """
+        Measure decode and detection speed for detection profiles
+        
+        Scene lists are compared against the 'full' profile: a profile matches
+        if it finds the same number of scenes and every cut is within
+        frame_stride frames of the reference cut.
+        
+        :param threshold: Sensitivity threshold
+        :param min_scene_len: Minimum scene length in seconds
+        :param detector_type: Detector type ('content' or 'adaptive')
+        :param profiles: Profiles to benchmark (default: all)
+        :return: Results for every profile
+        """
+        profiles = profiles or list(DETECTION_PROFILES)
+        if 'full' in profiles:
+            # Reference profile goes first
+            profiles = ['full'] + [name for name in profiles if name != 'full']
+        
+        fps = self.video_info.fps
+        frame_count = self.video_info.frame_count
+        frame_width = self.video_info.width
+        
+        min_scene_frames = self._min_scene_frames(min_scene_len, fps)
+        
+        print(f"⏱️  Benchmarking detection profiles: {self.video_path.name}")
+        print(f"   Frames: {frame_count}, FPS: {fps:.2f}, Detector: {detector_type}, Threshold: {threshold}")
+        
+        results = {}
+        reference_cuts = None
+        
+        for profile in profiles:
+            settings = self._profile_settings(profile)
+            downscale = settings['downscale'] or sd_scene_manager.compute_downscale_factor(frame_width)
+            
+            # Decode only: same frames and resolution the detector gets
+            start_time = time.time()
+            decoded = self._decode_frames(settings['frame_stride'], downscale)
+            decode_time = time.time() - start_time
+            
+            start_time = time.time()
+            detector = _create_detector(detector_type, threshold, min_scene_frames)
+            scene_list = _run_scene_manager(
+                str(self.video_path), detector, settings['downscale'], settings['frame_stride']
+            )
+            detect_time = time.time() - start_time
+            
+            cuts = [start.get_frames() for start, _ in scene_list[1:]]
+            if reference_cuts is None:
+                reference_cuts = cuts
+            matches = (
+                len(cuts) == len(reference_cuts)
+                and all(abs(a - b) <= settings['frame_stride'] for a, b in zip(cuts, reference_cuts))
+            )
+            
+            results[profile] = {
+                'downscale': downscale,
+                'frame_stride': settings['frame_stride'],
+                'decode_fps': decoded / decode_time if decode_time > 0 else 0,
+                'detect_fps': decoded / detect_time if detect_time > 0 else 0,
+                'scenes': len(scene_list),
+                'matches': matches
+            }
+        
+        print(f"\n   {'Profile':<8} {'Scale':>5} {'Stride':>6} {'Decode fps':>11} {'Detect fps':>11} {'Scenes':>7}  Match")
+        for profile, result in results.items():
+            print(f"   {profile:<8} {result['downscale']:>5} {result['frame_stride']:>6} "
+                  f"{result['decode_fps']:>11.1f} {result['detect_fps']:>11.1f} {result['scenes']:>7}  "
+                  f"{'✓' if result['matches'] else '✗'}")
+        
+        return results
+    
+    def _decode_frames(self, frame_stride: int = 1, downscale: int = 1) -> int:
+        """
+        Decode the video the same way the detector does, without analysis
+        
+        :param frame_stride: Keep every Nth frame (others are only grabbed)
+        :param downscale: Downscale factor for kept frames
+        :return: Number of source frames covered
+        """
+        cap = cv2.VideoCapture(str(self.video_path))
+        frame_num = 0
+        
+        while cap.grab():
+            if frame_num % frame_stride == 0:
+                ret, frame = cap.retrieve()
+                if ret and downscale > 1:
+                    cv2.resize(frame, (frame.shape[1] // downscale, frame.shape[0] // downscale),
+                               interpolation=cv2.INTER_LINEAR)
+            frame_num += 1
+        
+        cap.release()
+        return frame_num
+    
+    def _load_stats(self) -> Optional[List[float]]:
+        """
+        Load cached per-frame content scores
         
-        :param video_path: Path to video file
-        :param output_dir: Directory for saving results
-        :param transcript: Transcript text to include in HTML report
+        :return: content_val for every frame or None if there is no valid cache
         """
-        self.video_path = Path(video_path)
-        if not self.video_path.exists():
-            raise FileNotFoundError(f"Video file not found: {video_path}")
-        
-        # Create directory for results
-        if output_dir:
-            self.output_dir = Path(output_dir)
-        else:
-            self.output_dir = self.video_path.parent / f"{self.video_path.stem}_scenes"
+        if not self.stats_file.exists():
+            return None
         
-        self.output_dir.mkdir(exist_ok=True)
+        # Cache is outdated if the video changed after it was written
+        if self.stats_file.stat().st_mtime < self.video_path.stat().st_mtime:
+            return None
         
-        # Subdirectories for different output types
-        self.frames_dir = self.output_dir / "frames"
-        self.clips_dir = self.output_dir / "clips"
-        self.frames_dir.mkdir(exist_ok=True)
-        self.clips_dir.mkdir(exist_ok=True)
+        try:
+            scores = {}
+            with open(self.stats_file, 'r', newline='') as f:
+                reader = csv.DictReader(f)
+                if not reader.fieldnames or scenedetect.ContentDetector.FRAME_SCORE_KEY not in reader.fieldnames:
+                    return None
+                
+                for row in reader:
+                    value = row[scenedetect.ContentDetector.FRAME_SCORE_KEY]
+                    # Frame numbers in stats file are 1-based
+                    scores[int(row['Frame Number']) - 1] = float(value) if value and value != 'None' else 0.0
+        except (OSError, ValueError, KeyError) as e:
+            print(f"⚠️  Failed to read stats cache: {e}")
+            return None
         
-        self.scenes = []
-        self.scene_list = []
-        self.transcript = transcript
+        if not scores:
+            return None
         
-    def detect_scenes(self, 
-                     threshold: float = 30.0,
-                     min_scene_len: float = 0.5,
-                     detector_type: str = 'content') -> List[Tuple[FrameTimecode, FrameTimecode]]:
+        return [scores.get(frame_num, 0.0) for frame_num in range(max(scores) + 1)]
+    
+    def sweep_thresholds(self,
+                         thresholds: List[float],
+                         min_scene_len: float = 0.5,
+                         detector_type: str = 'content') -> Dict[float, int]:
         """
-        Detect scenes in video
+        Count scenes for several thresholds using cached frame stats
         
-        :param threshold: Sensitivity threshold (1-100, lower = more scenes)
+        The video is decoded only if there is no stats cache yet.
+        
+        :param thresholds: Thresholds to try
         :param min_scene_len: Minimum scene length in seconds
         :param detector_type: Detector type ('content' or 'adaptive')
+        :return: Number of scenes for every threshold
+        """
+        scores = self._load_stats()
+        if scores is None:
+            self.detect_scenes(thresholds[0], min_scene_len, detector_type)
+            scores = self._load_stats()
+            if scores is None:
+                print("❌ Failed to collect frame stats")
+                return {}
+        
+        fps = self.video_info.fps
+        min_scene_frames = self._min_scene_frames(min_scene_len, fps)
+        
+        print(f"\n📈 Threshold sweep ({detector_type}, min scene length: {min_scene_len}s):")
+        
+        results = {}
+        for threshold in thresholds:
+            cuts = _cuts_from_scores(detector_type, threshold, min_scene_frames, scores)
+            results[threshold] = len(self._build_scene_list(cuts, fps, len(scores)))
+            print(f"   Threshold {threshold:>6g}: {results[threshold]} scenes")
+        
+        return results
+    
+    def _detect_scenes_sharded(self,
+                               detector_type: str,
+                               threshold: float,
+                               min_scene_frames: int,
+                               fps: float,
+                               frame_count: int,
+                               jobs: int,
+                               downscale: int = 0,
+                               frame_stride: int = 1,
+                               luma_only: bool = False,
+                               quality: Optional[FrameQualityTracker] = None) -> List[Tuple[FrameTimecode, FrameTimecode]]:
+        """
+        Detect scenes in parallel time shards and stitch the results
+        
+        Every shard is analysed together with an overlap window on both sides,
+        so detectors are warmed up at the shard boundary. Each shard only keeps
+        cuts from its own time range, then duplicates left in the overlap
+        windows are dropped.
+        
+        :param detector_type: Detector type ('content' or 'adaptive')
+        :param threshold: Sensitivity threshold
+        :param min_scene_frames: Minimum scene length in frames
+        :param fps: Video FPS
+        :param frame_count: Total number of frames
+        :param jobs: Number of parallel processes
+        :param downscale: Downscale factor (0 = automatic)
+        :param frame_stride: Analyse every Nth frame
+        :param luma_only: Compare only brightness of frames
+        :param quality: Tracker collecting frame scores of all shards
         :return: List of scenes with timestamps
         """
-        # Get video information
-        cap = cv2.VideoCapture(str(self.video_path))
-        fps = cap.get(cv2.CAP_PROP_FPS)
-        frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
-        duration = frame_count / fps if fps > 0 else 0
-        cap.release()
+        overlap = max(2 * min_scene_frames, int(fps * 2), 1)
         
-        print(f"🔍 Analyzing video: {self.video_path.name}")
-        print(f"   Duration: {duration:.2f}s")
-        print(f"   Frames: {frame_count}")
-        print(f"   FPS: {fps:.2f}")
-        print(f"   Detector: {detector_type}")
-        print(f"   Threshold: {threshold}")
-        print(f"   Min scene length: {min_scene_len}s")
+        # Don't create shards that are mostly overlap
+        jobs = max(1, min(jobs, frame_count // (overlap * 4)))
+        shard_len = -(-frame_count // jobs)
         
-        # Choose detector
-        if detector_type == 'adaptive':
-            detector = AdaptiveDetector(
-                adaptive_threshold=threshold,
-                min_scene_len=int(min_scene_len * 30)  # Convert to frames (approximately 30fps)
-            )
-        else:
-            detector = ContentDetector(
-                threshold=threshold,
-                min_scene_len=int(min_scene_len * 30)
-            )
+        shards = []
+        for shard_start in range(0, frame_count, shard_len):
+            shard_end = min(shard_start + shard_len, frame_count)
+            shards.append((shard_start, shard_end))
         
-        # Detect scenes
-        scene_list = detect(str(self.video_path), detector)
+        print(f"   Shards: {len(shards)} x ~{shard_len} frames (overlap: {overlap} frames)")
         
-        if not scene_list:
-            print("⚠️  No scenes detected")
-            return []
+        with ProcessPoolExecutor(max_workers=len(shards)) as executor:
+            futures = [
+                executor.submit(
+                    _detect_shard,
+                    str(self.video_path),
+                    detector_type,
+                    threshold,
+                    min_scene_frames,
+                    downscale,
+                    frame_stride,
+                    max(0, shard_start - overlap),
+                    min(frame_count, shard_end + overlap),
+                    luma_only,
+                    quality is not None
+                )
+                for shard_start, shard_end in shards
+            ]
+            shard_results = [future.result() for future in futures]
         
-        print(f"\n✅ Found scenes: {len(scene_list)}")
+        # Keep only cuts from the shard's own range
+        cuts = []
+        for (shard_start, shard_end), (found, candidates) in zip(shards, shard_results):
+            cuts.extend(cut for cut in found if shard_start <= cut < shard_end)
+            if quality:
+                # Overlap frames are scored without their real predecessor
+                quality.merge({key: candidate for key, candidate in candidates.items()
+                               if shard_start <= candidate[1] < shard_end})
         
-        # Display scene information
-        for i, (start, end) in enumerate(scene_list, 1):
-            start_time = start.get_seconds()
-            end_time = end.get_seconds()
-            scene_duration = end_time - start_time
-            
-            print(f"   Scene {i:03d}: {self._format_time(start_time)} - {self._format_time(end_time)} (duration: {scene_duration:.2f}s)")
+        # Drop duplicate cuts around shard boundaries
+        merged_cuts = []
+        for cut in sorted(cuts):
+            if merged_cuts and cut - merged_cuts[-1] < max(min_scene_frames, 2):
+                continue
+            merged_cuts.append(cut)
         
-        self.scene_list = scene_list
-        return scene_list
+        return self._build_scene_list(merged_cuts, fps, frame_count)
+    
+    def _build_scene_list(self, cuts: List[int], fps: float, frame_count: int) -> List[Tuple[FrameTimecode, FrameTimecode]]:
+        """
+        Build scene list from cut frame numbers
+        
+        :param cuts: Sorted frame numbers where new scenes start
+        :param fps: Video FPS
+        :param frame_count: Total number of frames
+        :return: List of scenes with timestamps (empty if there are no cuts)
+        """
+        if not cuts:
+            return []
+        
+        return sd_scene_manager.get_scenes_from_cuts(
+            cut_list=[scenedetect.FrameTimecode(cut, fps=fps) for cut in cuts],
+            start_pos=scenedetect.FrameTimecode(0, fps=fps),
+            end_pos=scenedetect.FrameTimecode(frame_count, fps=fps)
+        )
     
     def _format_time(self, seconds: float) -> str:
         """Format time in HH:MM:SS format"""
@@ -127,124 +2789,807 @@ class SceneExtractor:
         secs = int(seconds % 60)
         return f"{hours:02d}h{minutes:02d}m{secs:02d}s"
     
-    def extract_frames(self, frame_type: str = 'middle') -> int:
+    def extract_frames(self,
+                       frame_type: str = 'middle',
+                       mode: str = 'seek',
+                       dedup: Optional[str] = None,
+                       dedup_distance: int = FRAME_DEDUP_DISTANCE,
+                       image_format: str = 'jpg',
+                       quality: Optional[int] = None,
+                       max_size: int = 0,
+                       workers: int = FRAME_WRITER_WORKERS,
+                       sizes: Optional[List[int]] = None) -> int:
         """
         Extract frames from scenes
         
         :param frame_type: Type of frame to extract ('first', 'middle', 'last', 'best')
+        :param mode: Extraction mode ('seek' - one seek per scene,
+                     'sequential' - single pass over the video)
+        :param dedup: Handling of near duplicate frames ('mark' - keep and point to the
+                      canonical frame in metadata, 'skip' - don't write them, None - off)
+        :param dedup_distance: Largest Hamming distance between perceptual hashes of duplicates
+        :param image_format: Image format ('jpg', 'webp' or 'png')
+        :param quality: JPEG/WebP quality 1-100 (default per format)
+        :param max_size: Longest side of saved frames in pixels (0 = full size)
+        :param workers: Encoding threads (0 = encode in the extraction loop)
+        :param sizes: Longest sides of renditions saved from every decoded frame into
+                      frames/<size>/ (0 = full size, in frames/full/), replaces max_size
         :return: Number of extracted frames
         """
         if not self.scene_list:
             print("❌ No scenes to extract frames from")
             return 0
         
-        print(f"\n📸 Extracting frames ({frame_type}) from {len(self.scene_list)} scenes...")
+        print(f"\n📸 Extracting frames ({frame_type}, {mode}) from {len(self.scene_list)} scenes...")
+        
+        self._reset_frame_records(dedup, dedup_distance)
+        writer = FrameWriter(image_format, quality, max_size, workers, sizes)
         
         # Get video FPS for frame calculations
-        cap = cv2.VideoCapture(str(self.video_path))
-        fps = cap.get(cv2.CAP_PROP_FPS)
-        cap.release()
+        fps = self.video_info.fps
+        
+        # Collect target frames for every scene
+        targets = [
+            (i,) + self._frame_target(start, end, frame_type, fps, i, writer.extension)
+            for i, (start, end) in enumerate(self.scene_list, 1)
+        ]
+        
+        start_time = time.time()
+        self._frame_writer = writer
+        
+        # Sequential mode never seeks without a keyframe index
+        reader = FrameReader(self.video_path, downscale=1, keyframes=self.keyframe_index,
+                             max_forward_grab=sys.maxsize if mode == 'sequential' else 0)
+        
+        if mode == 'sequential':
+            results = self._extract_frames_sequential(
+                [(frame_number, self.frames_dir / frame_filename, i)
+                 for i, frame_number, frame_filename in targets],
+                reader
+            )
+        else:
+            results = [
+                self._extract_frame(scenedetect.FrameTimecode(frame_number, fps=fps), self.frames_dir / frame_filename,
+                                    reader, i)
+                for i, frame_number, frame_filename in targets
+            ]
+        reader.release()
+        
+        # Frames are only on disk once the writer threads are done
+        writer.close()
+        self._frame_writer = None
+        for i, _, frame_filename in targets:
+            if any(path in writer.failed for path, _ in writer.outputs(self.frames_dir / frame_filename)):
+                results[i - 1] = False
+                self.frame_records.pop(i, None)
+        
+        elapsed_time = time.time() - start_time
         
         extracted_count = 0
         
-        for i, (start, end) in enumerate(self.scene_list, 1):
-            # Determine frame position
-            if frame_type == 'first':
-                frame_time = start
-            elif frame_type == 'last':
-                frame_time = end
-            elif frame_type == 'middle':
-                middle_time = (start.get_seconds() + end.get_seconds()) / 2
-                frame_time = FrameTimecode(middle_time, fps=fps)
-            elif frame_type == 'best':
-                # For best frame, we'll use middle for now
+        for (i, _, frame_filename), success in zip(targets, results):
+            if success:
+                print(f"   ✓ Scene {i:03d} -> {self._frame_output(i)}")
+                extracted_count += 1
+            else:
+                print(f"   ❌ Failed to extract frame from scene {i:03d}")
+        
+        duplicates = sum(1 for record in self.frame_records.values() if "duplicate_of" in record)
+        
+        print(f"\n✅ Saved frames: {extracted_count - (duplicates if dedup == 'skip' else 0)}")
+        if dedup:
+            print(f"   Duplicate frames: {duplicates} ({'skipped' if dedup == 'skip' else 'marked'}, "
+                  f"max distance: {dedup_distance} bits)")
+        if elapsed_time > 0:
+            print(f"   Extraction speed: {extracted_count / elapsed_time:.1f} frames/s ({elapsed_time:.2f}s)")
+        print(f"   Frames decoded: {reader.decoded}, seeks: {reader.seeks}"
+              f"{'' if reader.keyframes else ' (no keyframe index)'}")
+        print(f"   {writer.summary()}")
+        return extracted_count
+    
+    def _frame_target(self,
+                      start: FrameTimecode,
+                      end: FrameTimecode,
+                      frame_type: str,
+                      fps: float,
+                      scene_number: int,
+                      extension: str = '.jpg') -> Tuple[int, str]:
+        """
+        Frame to extract from a scene and its file name
+        
+        :param start: Scene start
+        :param end: Scene end
+        :param frame_type: Type of frame ('first', 'middle', 'last', 'best')
+        :param fps: Video FPS
+        :param scene_number: Scene number (from 1)
+        :param extension: Image file extension
+        :return: Tuple (frame number, frame file name)
+        """
+        # Determine frame position
+        if frame_type == 'first':
+            frame_time = start
+        elif frame_type == 'last':
+            frame_time = end
+        elif frame_type == 'middle':
+            middle_time = (start.get_seconds() + end.get_seconds()) / 2
+            frame_time = scenedetect.FrameTimecode(middle_time, fps=fps)
+        elif frame_type == 'best':
+            # Sharpest stable frame scored during detection, middle frame without scores
+            best = self.frame_quality.best(start.get_frames(), end.get_frames()) if self.frame_quality else None
+            if best:
+                frame_time = scenedetect.FrameTimecode(best["frame"], fps=fps)
+            else:
                 middle_time = (start.get_seconds() + end.get_seconds()) / 2
-                frame_time = FrameTimecode(middle_time, fps=fps)
+                frame_time = scenedetect.FrameTimecode(middle_time, fps=fps)
+        else:
+            frame_time = start
+        
+        frame_filename = f"scene_{scene_number:03d}_{self._format_time(start.get_seconds())}{extension}"
+        return int(frame_time.get_frames()), frame_filename
+    
+    def _extract_frame(self,
+                       frame_time: FrameTimecode,
+                       output_path: Path,
+                       reader: Optional[FrameReader] = None,
+                       scene_number: Optional[int] = None) -> bool:
+        """
+        Extract single frame at specified time
+        
+        :param frame_time: Frame position
+        :param output_path: Output image path
+        :param reader: Frame reader to reuse (a new one is opened if not set)
+        :param scene_number: Scene of the frame, recorded for metadata and deduplication
+        :return: Extraction success
+        """
+        own_reader = reader is None
+        try:
+            if own_reader:
+                reader = FrameReader(self.video_path, downscale=1, max_forward_grab=0, keyframes=self.keyframe_index)
+            
+            frame = reader.read(int(frame_time.get_frames()))
+            
+            if frame is not None:
+                self._save_frame(frame, output_path, scene_number)
+                return True
             else:
-                frame_time = start
+                return False
+                
+        except Exception as e:
+            print(f"   Error extracting frame: {e}")
+            return False
+        finally:
+            if own_reader and reader is not None:
+                reader.release()
+    
+    def _extract_frames_sequential(self, targets: List[Tuple[int, Path]], reader: FrameReader) -> List[bool]:
+        """
+        Extract several frames in a single pass over the video
+        
+        Frames between targets are only grabbed (demuxed and decoded without
+        conversion), wanted frames are retrieved and saved. With a keyframe
+        index, long gaps are skipped by seeking to the keyframe before the
+        next target.
+        
+        :param targets: List of (frame_number, output_path, scene_number) tuples
+        :param reader: Full size frame reader
+        :return: Success flag for every target, in input order
+        """
+        results = [False] * len(targets)
+        
+        try:
+            frame_number = -1
+            frame = None
             
-            # Extract frame
-            frame_filename = f"scene_{i:03d}_{self._format_time(start.get_seconds())}.jpg"
-            frame_path = self.frames_dir / frame_filename
+            for index in sorted(range(len(targets)), key=lambda k: targets[k][0]):
+                target, output_path, scene_number = targets[index]
+                
+                # Same frame wanted by several targets is read once
+                if target != frame_number or frame is None:
+                    frame_number = target
+                    frame = reader.read(target)
+                    if frame is None:
+                        continue
+                
+                self._save_frame(frame, output_path, scene_number)
+                results[index] = True
+            
+        except Exception as e:
+            print(f"   Error extracting frames: {e}")
+        
+        return results
+    
+    def _reset_frame_records(self, dedup: Optional[str] = None, dedup_distance: int = FRAME_DEDUP_DISTANCE):
+        """
+        Forget recorded frames and start a new deduplication index
+        
+        :param dedup: Handling of near duplicate frames ('mark', 'skip' or None)
+        :param dedup_distance: Largest Hamming distance between perceptual hashes of duplicates
+        """
+        self.frame_records = {}
+        self._frame_dedup = dedup
+        self._frame_hash_index = FrameHashIndex(dedup_distance) if dedup else None
+        self._frame_colors = {}
+    
+    def _save_frame(self, frame: 'np.ndarray', output_path: Path, scene_number: Optional[int] = None):
+        """
+        Write an extracted frame unless it is a skipped duplicate, and record it
+        
+        Frames go to the current frame writer (plain cv2.imwrite without one).
+        With deduplication on, the frame's perceptual hash is looked up among
+        frames extracted before it, and a match must also have about the same
+        mean color. A near duplicate points to the scene of the canonical
+        (first) frame and, in skip mode, takes over its files.
+        
+        :param frame: BGR frame
+        :param output_path: Output image path
+        :param scene_number: Scene of the frame (frames without one are written, not recorded)
+        """
+        if scene_number is None:
+            self._write_frame(frame, output_path)
+            return
+        
+        record = {"file": output_path.name}
+        
+        if self._frame_hash_index is not None:
+            frame_hash = _frame_hash(frame)
+            color = cv2.mean(frame)[:3]
+            record["hash"] = f"{frame_hash:016x}"
+            match = self._frame_hash_index.find(
+                frame_hash,
+                lambda key: max(abs(a - b) for a, b in zip(color, self._frame_colors[key])) <= FRAME_DEDUP_COLOR_TOLERANCE
+            )
+            if match:
+                canonical, distance = match
+                record["duplicate_of"] = canonical
+                record["distance"] = distance
+                if self._frame_dedup == 'skip':
+                    record["file"] = self.frame_records[canonical]["file"]
+                    if "renditions" in self.frame_records[canonical]:
+                        record["renditions"] = self.frame_records[canonical]["renditions"]
+                    # Don't leave stale copies from an earlier run
+                    for path, _ in self._frame_outputs(output_path):
+                        path.unlink(missing_ok=True)
+                    self.frame_records[scene_number] = record
+                    return
+            else:
+                self._frame_hash_index.add(frame_hash, scene_number)
+                self._frame_colors[scene_number] = color
+        
+        if self._frame_writer is not None and self._frame_writer.sizes:
+            record["renditions"] = {}
+            for path, max_size in self._frame_writer.outputs(output_path):
+                width, height = _fit_size(frame.shape[1], frame.shape[0], max_size)
+                record["renditions"][_size_label(max_size)] = {
+                    "file": path.relative_to(self.output_dir).as_posix(),
+                    "width": width,
+                    "height": height
+                }
+        
+        self._write_frame(frame, output_path)
+        self.frame_records[scene_number] = record
+    
+    def _frame_outputs(self, output_path: Path) -> List[Tuple[Path, int]]:
+        """Files the current frame writer produces for a frame (just output_path without one)"""
+        if self._frame_writer is not None:
+            return self._frame_writer.outputs(output_path)
+        return [(output_path, 0)]
+    
+    def _write_frame(self, frame: 'np.ndarray', output_path: Path):
+        """Write a frame with the current frame writer or synchronously with defaults"""
+        if self._frame_writer is not None:
+            self._frame_writer.write(frame, output_path)
+        else:
+            cv2.imwrite(str(output_path), frame)
+    
+    def _frame_output(self, scene_number: int) -> str:
+        """Frame file of a scene for progress output, with the canonical scene of duplicates"""
+        record = self.frame_records.get(scene_number, {})
+        if "duplicate_of" not in record:
+            return record.get("file", "")
+        return f"{record['file']} (duplicate of scene {record['duplicate_of']:03d})"
+    
+    def extract_scene(self,
+                      scene_number: int,
+                      start: FrameTimecode,
+                      end: FrameTimecode,
+                      frame_type: Optional[str] = 'middle',
+                      clip: bool = False,
+                      clip_mode: str = 'copy',
+                      dedup: Optional[str] = None,
+                      dedup_distance: int = FRAME_DEDUP_DISTANCE,
+                      image_format: str = 'jpg',
+                      quality: Optional[int] = None,
+                      max_size: int = 0,
+                      sizes: Optional[List[int]] = None) -> bool:
+        """
+        Extract frame and/or clip of a single scene (used while streaming)
+        
+        :param scene_number: Scene number (from 1)
+        :param start: Scene start
+        :param end: Scene end
+        :param frame_type: Type of frame to extract, None to skip frames
+        :param clip: Extract video clip
+        :param clip_mode: Clip cutting mode ('copy', 'smart', 'reencode', 'hls')
+        :param dedup: Handling of near duplicate frames ('mark', 'skip' or None)
+        :param dedup_distance: Largest Hamming distance between perceptual hashes of duplicates
+        :param image_format: Image format ('jpg', 'webp' or 'png')
+        :param quality: JPEG/WebP quality 1-100 (default per format)
+        :param max_size: Longest side of the saved frame in pixels (0 = full size)
+        :param sizes: Longest sides of renditions in frames/<size>/ (0 = full size), replaces max_size
+        :return: True if everything requested was extracted
+        """
+        outputs = []
+        success = True
+        
+        if frame_type:
+            # Frames of earlier scenes stay in the deduplication index
+            if not self.frame_records or self._frame_dedup != dedup:
+                self._reset_frame_records(dedup, dedup_distance)
+            
+            # One frame per call, encoded right away
+            self._frame_writer = FrameWriter(image_format, quality, max_size, sizes=sizes)
+            frame_number, frame_filename = self._frame_target(start, end, frame_type, start.get_framerate(),
+                                                              scene_number, self._frame_writer.extension)
+            extracted = self._extract_frame(scenedetect.FrameTimecode(frame_number, fps=start.get_framerate()),
+                                            self.frames_dir / frame_filename, scene_number=scene_number)
+            extracted = extracted and not self._frame_writer.failed
+            self._frame_writer = None
+            if extracted:
+                outputs.append(self._frame_output(scene_number))
+            else:
+                self.frame_records.pop(scene_number, None)
+                success = False
+        
+        if clip:
+            clip_filename = f"scene_{scene_number:03d}_{self._format_time(start.get_seconds())}{self._clip_suffix(clip_mode)}"
+            if self._extract_clip(start, end, self.clips_dir / clip_filename, clip_mode):
+                outputs.append(clip_filename)
+            else:
+                success = False
+        
+        if outputs:
+            print(f"   ✓ Scene {scene_number:03d} -> {', '.join(outputs)}")
+        if not success:
+            print(f"   ❌ Failed to extract scene {scene_number:03d}")
+        return success
+    
+    def extract_clips(self, scene_numbers: Optional[List[int]] = None, mode: str = 'copy') -> int:
+        """
+        Extract video clips for each scene
+        
+        In copy mode, clips covering most of the video are cut by a single
+        ffmpeg process with the segment muxer, sparse subsets are cut one by
+        one with fast input seeking. Smart and re-encode modes cut every
+        clip frame-accurately on its own. HLS mode writes a playlist per
+        scene instead of clip files.
+        
+        :param scene_numbers: Scenes to extract (numbers from 1, None = all)
+        :param mode: Clip cutting mode ('copy', 'smart', 'reencode', 'hls')
+        :return: Number of extracted clips
+        """
+        if not self.scene_list:
+            print("❌ No scenes to extract clips from")
+            return 0
+        
+        if scene_numbers:
+            numbers = sorted(i for i in set(scene_numbers) if 1 <= i <= len(self.scene_list))
+        else:
+            numbers = list(range(1, len(self.scene_list) + 1))
+        
+        print(f"\n🎬 Extracting clips ({mode}) from {len(numbers)} scenes...")
+        
+        if mode == 'smart' and not self._smart_cut_supported():
+            print(f"   ⚠️  Smart cut needs a keyframe index and an H.264/HEVC video, re-encoding clips")
+            mode = 'reencode'
+        
+        clip_paths = {}
+        for i in numbers:
+            start, _ = self.scene_list[i - 1]
+            clip_paths[i] = self.clips_dir / f"scene_{i:03d}_{self._format_time(start.get_seconds())}{self._clip_suffix(mode)}"
+        
+        covered = sum(end.get_seconds() - start.get_seconds() for start, end in
+                      (self.scene_list[i - 1] for i in numbers))
+        total = self.scene_list[-1][1].get_seconds()
+        
+        start_time = time.time()
+        
+        results = {}
+        if mode == 'copy' and total > 0 and covered / total >= CLIP_SEGMENT_MIN_COVERAGE:
+            results = self._extract_clips_segmented(clip_paths)
+        
+        extracted_count = 0
+        reencoded_frames = 0
+        total_frames = 0
+        
+        for i in numbers:
+            start, end = self.scene_list[i - 1]
+            clip_path = clip_paths[i]
+            
+            # Scenes the segment muxer couldn't cut separately are cut with input seeking
+            if i not in results:
+                results[i] = self._extract_clip(start, end, clip_path, mode)
             
-            if self._extract_frame(frame_time, frame_path):
-                print(f"   ✓ Scene {i:03d} -> {frame_filename}")
+            if mode == 'smart':
+                first, last = int(start.get_frames()), int(end.get_frames())
+                plan = self._smart_cut_plan(first, last)
+                reencoded_frames += (plan[0] - first) + (last - plan[1]) if plan else last - first
+                total_frames += last - first
+            
+            if results[i]:
+                print(f"   ✓ Scene {i:03d} -> {clip_path.name}")
                 extracted_count += 1
             else:
-                print(f"   ❌ Failed to extract frame from scene {i:03d}")
+                print(f"   ❌ Failed to extract clip from scene {i:03d}")
+        
+        elapsed_time = time.time() - start_time
         
-        print(f"\n✅ Saved frames: {extracted_count}")
+        print(f"\n✅ Saved clips: {extracted_count}")
+        if elapsed_time > 0:
+            print(f"   Clip extraction ({mode}): {elapsed_time:.2f}s ({extracted_count / elapsed_time:.1f} clips/s)")
+        if total_frames:
+            print(f"   Re-encoded frames: {reencoded_frames} of {total_frames}"
+                  f" ({reencoded_frames / total_frames * 100:.1f}%)")
         return extracted_count
     
-    def _extract_frame(self, frame_time: FrameTimecode, output_path: Path) -> bool:
-        """Extract single frame at specified time"""
+    def _extract_clips_segmented(self, clip_paths: Dict[int, Path]) -> Dict[int, bool]:
+        """
+        Cut all scenes in a single pass with the ffmpeg segment muxer
+        
+        Streams are copied, so segments start at the keyframe preceding each
+        scene start (taken from the keyframe index) and end where the next
+        segment starts, at the keyframe preceding the next scene. A segment
+        only holds its whole scene when the next scene starts exactly on a
+        keyframe. Other scenes, and scenes starting in the same GOP as
+        another scene, are left out and cut one by one, so a scene's clip
+        doesn't depend on the path that cut it.
+        
+        :param clip_paths: Output clip path by scene number
+        :return: Success flag by scene number for the scenes that were cut
+        """
+        keyframes = self.keyframe_index
+        if not keyframes:
+            return {}
+        
+        # Segment start of every scene (stream copy cuts at keyframes only)
+        starts = [round(keyframes.preceding_time(start.get_seconds()), 6) for start, _ in self.scene_list]
+        times = sorted(set(t for t in starts if t > 0))
+        
+        segment_of = {}
+        for i, segment_start in enumerate(starts, 1):
+            if starts.count(segment_start) != 1:
+                continue
+            # The segment ends at the next scene's keyframe, which must be the scene end
+            if i < len(self.scene_list):
+                next_start = int(self.scene_list[i][0].get_frames())
+                if keyframes.preceding_frame(next_start) != next_start:
+                    continue
+            segment_of[i] = sum(1 for t in times if t <= segment_start)
+        
+        if not any(i in segment_of for i in clip_paths):
+            return {}
+        
+        pattern = self.clips_dir / ".segment_%05d.mp4"
+        cmd = [
+            "ffmpeg",
+            "-i", str(self.video_path),
+            "-c", "copy",
+            "-f", "segment",
+            "-segment_format", "mp4",
+            "-reset_timestamps", "1"
+        ]
+        if times:
+            cmd.extend([
+                "-segment_times", ",".join(f"{t:.6f}" for t in times),
+                # Keyframe times are exact, tolerate rounding by half a frame
+                "-segment_time_delta", f"{0.5 / (self.video_info.fps or 25):.6f}"
+            ])
+        cmd.extend(["-y", str(pattern)])
+        
+        results = {}
+        try:
+            result = subprocess.run(cmd, capture_output=True, text=True)
+            if result.returncode == 0:
+                for i, clip_path in clip_paths.items():
+                    if i not in segment_of:
+                        continue
+                    segment = Path(str(pattern) % segment_of[i])
+                    if segment.exists() and segment.stat().st_size > 0:
+                        os.replace(segment, clip_path)
+                        results[i] = True
+            else:
+                print(f"   ⚠️  Segment muxer failed (code: {result.returncode}), cutting clips one by one")
+        except Exception as e:
+            print(f"   Error extracting clips: {e}")
+        finally:
+            for segment in self.clips_dir.glob(".segment_*.mp4"):
+                segment.unlink()
+        
+        return results
+    
+    def _extract_clip(self, start: FrameTimecode, end: FrameTimecode, output_path: Path, mode: str = 'copy') -> bool:
+        """
+        Extract video clip between start and end times
+        
+        In copy mode streams are copied, so the clip starts at the keyframe
+        preceding the scene start (taken from the keyframe index) and plays
+        from its first frame. Without an index ffmpeg picks the keyframe itself.
+        
+        :param start: Scene start
+        :param end: Scene end
+        :param output_path: Output clip path
+        :param mode: Clip cutting mode ('copy', 'smart', 'reencode', 'hls')
+        :return: Extraction success
+        """
+        if mode == 'hls':
+            return self._write_scene_playlist(start, end, output_path)
+        if mode == 'smart':
+            return self._smart_cut_clip(start, end, output_path)
+        if mode == 'reencode':
+            return self._encode_range(int(start.get_frames()), int(end.get_frames()), output_path)
+        
+        try:
+            start_time = start.get_seconds()
+            if self.keyframe_index:
+                start_time = self.keyframe_index.preceding_time(start_time)
+            duration = end.get_seconds() - start_time
+            
+            cmd = [
+                "ffmpeg",
+                "-ss", f"{start_time:.6f}",
+                "-i", str(self.video_path),
+                "-t", f"{duration:.6f}",
+                "-c", "copy",
+                "-avoid_negative_ts", "make_zero",
+                "-y", str(output_path)
+            ]
+            
+            result = subprocess.run(cmd, capture_output=True, text=True)
+            return result.returncode == 0
+            
+        except Exception as e:
+            print(f"   Error extracting clip: {e}")
+            return False
+    
+    def _clip_suffix(self, mode: str) -> str:
+        """Clip file extension for a clip mode"""
+        return ".m3u8" if mode == 'hls' else ".mp4"
+    
+    def _get_hls_rendition(self) -> Optional[Tuple[List[str], List[Tuple[float, float, List[str]]]]]:
+        """
+        Single-file fMP4 HLS copy of the video shared by all scene playlists
+        
+        Streams are copied once (no re-encoding) with a fragment at every
+        keyframe, so scenes start as close to their first frame as possible.
+        
+        :return: Tuple (playlist header lines, fragments as (start, duration, playlist lines)),
+                 None if ffmpeg fails
+        """
+        if self._hls_rendition_path == self.video_path:
+            return self._hls_rendition
+        
+        playlist = self.clips_dir / f"{HLS_RENDITION}.m3u8"
+        cmd = [
+            "ffmpeg",
+            "-i", str(self.video_path),
+            "-c", "copy",
+            "-f", "hls",
+            "-hls_segment_type", "fmp4",
+            "-hls_flags", "single_file",
+            "-hls_playlist_type", "vod",
+            "-hls_time", "0.001",
+            "-y", str(playlist)
+        ]
+        
+        self._hls_rendition = None
+        self._hls_rendition_path = self.video_path
+        try:
+            result = subprocess.run(cmd, capture_output=True, text=True)
+            if result.returncode != 0:
+                print(f"   ❌ Failed to write HLS copy of the video (code: {result.returncode})")
+                return None
+            
+            header = []
+            fragments = []
+            fragment_start = 0.0
+            pending = []
+            for line in playlist.read_text(encoding='utf-8').splitlines():
+                if line.startswith("#EXTINF:"):
+                    duration = float(line[len("#EXTINF:"):].split(',')[0])
+                    pending = [line]
+                elif pending:
+                    pending.append(line)
+                    if not line.startswith('#'):
+                        fragments.append((fragment_start, duration, pending))
+                        fragment_start += duration
+                        pending = []
+                elif line and not line.startswith(("#EXT-X-TARGETDURATION", "#EXT-X-MEDIA-SEQUENCE", "#EXT-X-ENDLIST")):
+                    header.append(line)
+            
+            self._hls_rendition = (header, fragments)
+        except Exception as e:
+            print(f"   Error writing HLS copy of the video: {e}")
+        
+        return self._hls_rendition
+    
+    def _write_scene_playlist(self, start: FrameTimecode, end: FrameTimecode, output_path: Path) -> bool:
+        """
+        Write HLS playlist of a scene with byte ranges into the shared fMP4 copy
+        
+        The playlist lists the fragments overlapping the scene, and
+        EXT-X-START makes players begin at the exact scene start inside the
+        first fragment.
+        
+        :param start: Scene start
+        :param end: Scene end
+        :param output_path: Output playlist path
+        :return: Success
+        """
+        rendition = self._get_hls_rendition()
+        if rendition is None:
+            return False
+        header, fragments = rendition
+        
+        start_time, end_time = start.get_seconds(), end.get_seconds()
+        selected = [fragment for fragment in fragments
+                    if fragment[0] < end_time - 1e-3 and fragment[0] + fragment[1] > start_time + 1e-3]
+        if not selected:
+            return False
+        
+        lines = header[:1] + [
+            f"#EXT-X-TARGETDURATION:{math.ceil(max(duration for _, duration, _ in selected))}",
+            "#EXT-X-MEDIA-SEQUENCE:0"
+        ] + header[1:] + [
+            f"#EXT-X-START:TIME-OFFSET={max(0.0, start_time - selected[0][0]):.6f},PRECISE=YES"
+        ]
+        for _, _, fragment_lines in selected:
+            lines.extend(fragment_lines)
+        lines.append("#EXT-X-ENDLIST")
+        
+        try:
+            with open(output_path, 'w', encoding='utf-8') as f:
+                f.write('\n'.join(lines) + '\n')
+            return True
+        except OSError as e:
+            print(f"   Error writing playlist: {e}")
+            return False
+    
+    def _encode_range(self, first: int, last: int, output_path: Path, audio: bool = True) -> bool:
+        """
+        Re-encode frames [first, last) frame-accurately
+        
+        :param first: First frame number
+        :param last: Frame number after the last frame
+        :param output_path: Output clip path
+        :param audio: Include audio (smart-cut pieces are video only)
+        :return: Extraction success
+        """
+        fps = self.video_info.fps
+        cmd = [
+            "ffmpeg",
+            # Half a frame early, so rounding can't skip the first frame
+            "-ss", f"{max(0.0, (first - 0.5) / fps):.6f}",
+            "-i", str(self.video_path),
+            "-frames:v", str(last - first),
+            # Timestamps from 0, otherwise the half frame offset is filled with a duplicate
+            "-vf", "setpts=PTS-STARTPTS",
+            "-c:v", CLIP_ENCODERS.get(self.video_info.codec, 'libx264')
+        ] + CLIP_ENCODE_ARGS
+        if audio:
+            cmd.extend(["-af", "asetpts=PTS-STARTPTS", "-c:a", "aac"])
+        else:
+            cmd.append("-an")
+        cmd.extend(["-y", str(output_path)])
+        
         try:
-            cap = cv2.VideoCapture(str(self.video_path))
-            
-            # Set position
-            frame_number = int(frame_time.get_frames())
-            cap.set(cv2.CAP_PROP_POS_FRAMES, frame_number)
-            
-            # Read frame
-            ret, frame = cap.read()
-            cap.release()
-            
-            if ret:
-                cv2.imwrite(str(output_path), frame)
-                return True
-            else:
-                return False
-                
+            result = subprocess.run(cmd, capture_output=True, text=True)
+            return result.returncode == 0
         except Exception as e:
-            print(f"   Error extracting frame: {e}")
+            print(f"   Error extracting clip: {e}")
             return False
     
-    def extract_clips(self) -> int:
+    def _smart_cut_supported(self) -> bool:
+        """Whether edges can be re-encoded to match the copied middle of clips"""
+        return bool(self.keyframe_index) and self.video_info.codec in CLIP_ENCODERS
+    
+    def _smart_cut_plan(self, first: int, last: int) -> Optional[Tuple[int, int]]:
         """
-        Extract video clips for each scene
+        Part of a clip that can be stream-copied
         
-        :return: Number of extracted clips
+        :param first: First frame number of the clip
+        :param last: Frame number after the last frame of the clip
+        :return: Tuple (first keyframe in the clip, last keyframe in the clip
+                 or the end of the video), None if no whole GOP fits
         """
-        if not self.scene_list:
-            print("❌ No scenes to extract clips from")
-            return 0
+        if not self._smart_cut_supported():
+            return None
         
-        print(f"\n🎬 Extracting clips from {len(self.scene_list)} scenes...")
-        
-        extracted_count = 0
+        keyframes = self.keyframe_index
+        k = keyframes.preceding(first)
+        if keyframes.frames[k] < first:
+            k += 1
+        if k >= len(keyframes):
+            return None
+        copy_start = int(keyframes.frames[k])
         
-        for i, (start, end) in enumerate(self.scene_list, 1):
-            clip_filename = f"scene_{i:03d}_{self._format_time(start.get_seconds())}.mp4"
-            clip_path = self.clips_dir / clip_filename
-            
-            if self._extract_clip(start, end, clip_path):
-                print(f"   ✓ Scene {i:03d} -> {clip_filename}")
-                extracted_count += 1
-            else:
-                print(f"   ❌ Failed to extract clip from scene {i:03d}")
+        # The partial GOP before the clip end references frames after it, except at the end of the video
+        copy_end = last if last >= self.video_info.frame_count else keyframes.preceding_frame(last)
         
-        print(f"\n✅ Saved clips: {extracted_count}")
-        return extracted_count
+        if copy_start >= copy_end:
+            return None
+        return copy_start, copy_end
     
-    def _extract_clip(self, start: FrameTimecode, end: FrameTimecode, output_path: Path) -> bool:
-        """Extract video clip between start and end times"""
+    def _smart_cut_clip(self, start: FrameTimecode, end: FrameTimecode, output_path: Path) -> bool:
+        """
+        Extract frame-accurate clip re-encoding only the partial GOPs at its edges
+        
+        The head up to the first keyframe and the tail from the last keyframe
+        are re-encoded with the source codec, the GOPs in between are copied
+        and the pieces are joined with the concat demuxer. Audio is
+        re-encoded, copied audio would start at the keyframe too.
+        
+        :param start: Scene start
+        :param end: Scene end
+        :param output_path: Output clip path
+        :return: Extraction success
+        """
+        first, last = int(start.get_frames()), int(end.get_frames())
+        plan = self._smart_cut_plan(first, last)
+        if plan is None:
+            return self._encode_range(first, last, output_path)
+        copy_start, copy_end = plan
+        
         try:
-            import subprocess
-            
-            start_time = start.get_seconds()
-            duration = end.get_seconds() - start_time
-            
-            cmd = [
-                "ffmpeg",
-                "-i", str(self.video_path),
-                "-ss", str(start_time),
-                "-t", str(duration),
-                "-c", "copy",
-                "-y", str(output_path)
-            ]
-            
-            result = subprocess.run(cmd, capture_output=True, text=True)
-            return result.returncode == 0
+            with tempfile.TemporaryDirectory(prefix=".smart_", dir=self.clips_dir) as temp_dir:
+                temp_dir = Path(temp_dir)
+                pieces = []
+                
+                if first < copy_start:
+                    pieces.append(temp_dir / "head.mp4")
+                    if not self._encode_range(first, copy_start, pieces[-1], audio=False):
+                        return False
+                
+                pieces.append(temp_dir / "middle.mp4")
+                cmd = [
+                    "ffmpeg",
+                    # A quarter frame after the keyframe, the seek lands exactly on it
+                    "-ss", f"{self.keyframe_index.time_of(copy_start) + 0.25 / self.video_info.fps:.6f}",
+                    "-i", str(self.video_path),
+                    "-map", "0:v:0",
+                    "-frames:v", str(copy_end - copy_start),
+                    "-c", "copy",
+                    # Keep the keyframe at a non-negative time, MP4 edit lists would hide it
+                    "-avoid_negative_ts", "make_zero",
+                    "-y", str(pieces[-1])
+                ]
+                if subprocess.run(cmd, capture_output=True, text=True).returncode != 0:
+                    return False
+                
+                if copy_end < last:
+                    pieces.append(temp_dir / "tail.mp4")
+                    if not self._encode_range(copy_end, last, pieces[-1], audio=False):
+                        return False
+                
+                concat_list = temp_dir / "pieces.txt"
+                with open(concat_list, 'w', encoding='utf-8') as f:
+                    f.writelines(f"file '{piece.name}'\n" for piece in pieces)
+                
+                cmd = [
+                    "ffmpeg",
+                    "-f", "concat",
+                    "-safe", "0",
+                    "-i", str(concat_list),
+                    "-ss", f"{start.get_seconds():.6f}",
+                    "-i", str(self.video_path),
+                    "-map", "0:v",
+                    "-map", "1:a?",
+                    "-c:v", "copy",
+                    # Audio is cut to the clip alone, -shortest could drop video frames
+                    "-af", f"atrim=end={end.get_seconds() - start.get_seconds():.6f}",
+                    "-c:a", "aac",
+                    "-y", str(output_path)
+                ]
+                result = subprocess.run(cmd, capture_output=True, text=True)
+                return result.returncode == 0
             
         except Exception as e:
             print(f"   Error extracting clip: {e}")
@@ -259,15 +3604,7 @@ class SceneExtractor:
         }
         
         for i, (start, end) in enumerate(self.scene_list, 1):
-            scene_info = {
-                "scene_number": i,
-                "start_time": start.get_seconds(),
-                "end_time": end.get_seconds(),
-                "duration": end.get_seconds() - start.get_seconds(),
-                "start_frame": start.get_frames(),
-                "end_frame": end.get_frames()
-            }
-            metadata["scenes"].append(scene_info)
+            metadata["scenes"].append(self._scene_info(i, start, end))
         
         metadata_file = self.output_dir / "scenes_metadata.json"
         with open(metadata_file, 'w') as f:
@@ -275,6 +3612,33 @@ class SceneExtractor:
         
         print(f"💾 Metadata saved: {metadata_file}")
     
+    def _scene_info(self, scene_number: int, start: FrameTimecode, end: FrameTimecode) -> Dict:
+        """
+        Metadata record of a scene
+        
+        :param scene_number: Scene number (from 1)
+        :param start: Scene start
+        :param end: Scene end
+        :return: Scene metadata dictionary
+        """
+        info = {
+            "scene_number": scene_number,
+            "start_time": start.get_seconds(),
+            "end_time": end.get_seconds(),
+            "duration": end.get_seconds() - start.get_seconds(),
+            "start_frame": start.get_frames(),
+            "end_frame": end.get_frames()
+        }
+        
+        best = self.frame_quality.best(start.get_frames(), end.get_frames()) if self.frame_quality else None
+        if best:
+            info["best_frame"] = dict(best, time=best["frame"] / start.get_framerate())
+        
+        if scene_number in self.frame_records:
+            info["frame"] = self.frame_records[scene_number]
+        
+        return info
+    
     def generate_html_report(self):
         """Generate HTML report with scene information"""
         if not self.scene_list:
@@ -316,6 +3680,8 @@ class SceneExtractor:
         .scene-duration {{ color: #888; }}
         .frame-preview {{ margin-top: 10px; }}
         .frame-preview img {{ max-width: 200px; border: 1px solid #ccc; }}
+        .clip-preview {{ margin-top: 10px; }}
+        .clip-preview video {{ max-width: 400px; }}
     </style>
 </head>
 <body>
@@ -327,13 +3693,35 @@ class SceneExtractor:
 {transcript_html}
 """
         
+        has_playlists = False
+        
         for i, (start, end) in enumerate(self.scene_list, 1):
             start_time = start.get_seconds()
             end_time = end.get_seconds()
             duration = end_time - start_time
             
+            # Clip file or HLS playlist of the scene
+            clip_name = f"scene_{i:03d}_{self._format_time(start_time)}"
+            clip_html = ""
+            if (self.clips_dir / f"{clip_name}.mp4").exists():
+                clip_html = f"""
+        <div class="clip-preview">
+            <video controls preload="none" src="clips/{clip_name}.mp4"></video>
+        </div>"""
+            elif (self.clips_dir / f"{clip_name}.m3u8").exists():
+                has_playlists = True
+                clip_html = f"""
+        <div class="clip-preview">
+            <video controls preload="none" data-hls="clips/{clip_name}.m3u8"></video>
+        </div>"""
+            
             # Check if frame exists
             frame_filename = f"scene_{i:03d}_{self._format_time(start_time)}.jpg"
+            # Skipped duplicates show their canonical frame, renditions the smallest one
+            record = self.frame_records.get(i, {})
+            frame_filename = record.get("file", frame_filename)
+            if record.get("renditions"):
+                frame_filename = Path(list(record["renditions"].values())[-1]["file"]).relative_to("frames").as_posix()
             frame_path = self.frames_dir / frame_filename
             
             frame_html = ""
@@ -347,10 +3735,32 @@ class SceneExtractor:
     <div class="scene">
         <div class="scene-number">Scene {i}</div>
         <div class="scene-time">{self._format_time(start_time)} - {self._format_time(end_time)}</div>
-        <div class="scene-duration">Duration: {duration:.2f}s</div>{frame_html}
+        <div class="scene-duration">Duration: {duration:.2f}s</div>{frame_html}{clip_html}
     </div>
 """
         
+        if has_playlists:
+            # Safari plays HLS natively, other browsers through the local hls.js copy
+            if HLS_JS_PATH.is_file():
+                shutil.copy2(HLS_JS_PATH, self.output_dir / "hls.min.js")
+                html_content += """
+    <script src="hls.min.js"></script>"""
+            else:
+                print(f"⚠️  hls.js not found at {HLS_JS_PATH}, scene playlists will play only in browsers with native HLS")
+            html_content += """
+    <script>
+        document.querySelectorAll('video[data-hls]').forEach(function (video) {
+            if (video.canPlayType('application/vnd.apple.mpegurl')) {
+                video.src = video.dataset.hls;
+            } else if (window.Hls && Hls.isSupported()) {
+                var hls = new Hls();
+                hls.loadSource(video.dataset.hls);
+                hls.attachMedia(video);
+            }
+        });
+    </script>
+"""
+        
         html_content += """
 </body>
 </html>
@@ -363,6 +3773,34 @@ class SceneExtractor:
         print(f"📄 HTML report: {html_file}")
 
 
+def check_dependencies() -> bool:
+    """
+    Report installed dependencies from package metadata, without importing them
+    
+    :return: True if all required dependencies are available
+    """
+    from importlib.metadata import version, PackageNotFoundError
+    from importlib.util import find_spec
+    
+    ok = True
+    for module_name, dist_name, required in DEPENDENCIES:
+        if find_spec(module_name) is None:
+            print(f"❌ {dist_name}: not installed")
+            ok = ok and not required
+            continue
+        try:
+            print(f"✓ {dist_name} {version(dist_name)}")
+        except PackageNotFoundError:
+            # Installed under another distribution name (e.g. opencv-python-headless)
+            print(f"✓ {dist_name}")
+    
+    for tool in ("ffmpeg", "ffprobe"):
+        # Needed by ffmpeg-based backends, detectors and clip extraction only
+        print(f"{'✓' if shutil.which(tool) else '⚠️ '} {tool}: {shutil.which(tool) or 'not found'}")
+    
+    return ok
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="Detect and extract scenes from video",
@@ -372,15 +3810,74 @@ Usage examples:
   # Basic scene detection
   python scene_detector.py video.mp4
   
+  # Check dependencies (fast, nothing heavy is imported)
+  python scene_detector.py --check
+  
   # With custom threshold
   python scene_detector.py video.mp4 --threshold 10
   
+  # Use 8 processes for a long video
+  python scene_detector.py video.mp4 --jobs 8
+  
+  # Fast detection profile and profile benchmark
+  python scene_detector.py video.mp4 --profile fast
+  python scene_detector.py video.mp4 --benchmark
+  
+  # Decode with ffmpeg (scaling and pixel format conversion in ffmpeg)
+  python scene_detector.py video.mp4 --detector numpy --backend ffmpeg-pipe
+  
+  # Use ffmpeg scene change score instead of PySceneDetect
+  python scene_detector.py video.mp4 --detector ffmpeg-scene --threshold 30
+  
+  # Triage run comparing keyframes only
+  python scene_detector.py video.mp4 --keyframes-only
+  
+  # Static slides: compare keyframes, decode only GOPs with a slide change
+  python scene_detector.py video.mp4 --bisect --sample-interval 2
+  
+  # Screencast: ignore the webcam overlay in the bottom right corner
+  python scene_detector.py video.mp4 --detector slides --exclude 960,540,320,180
+  
+  # Detect scenes while downloading an HLS stream, keeping an MP4 copy
+  python scene_detector.py https://example.com/video.m3u8 -o scenes --remux video.mp4 --extract-frames
+  
+  # Lecture: look for slide changes only around speech pauses
+  python scene_detector.py video.mp4 --audio-guided --audio-recall
+  
+  # Extract frames while detection is still running
+  python scene_detector.py video.mp4 --stream --extract-frames
+  
+  # Coarse pass on every 10th frame at 64px, exact cuts from a second pass
+  python scene_detector.py video.mp4 --two-pass --coarse-stride 10 --coarse-width 64
+  
+  # Scene counts for several thresholds (decodes the video only once)
+  python scene_detector.py video.mp4 --sweep 3,5,10,20
+  
   # Extract frames from scenes
   python scene_detector.py video.mp4 --extract-frames
   
+  # Extract frames in a single pass (faster for many scenes)
+  python scene_detector.py video.mp4 --extract-frames --extraction-mode sequential
+  
+  # Lecture with repeated slides: don't write near duplicate frames
+  python scene_detector.py video.mp4 --extract-frames --dedup-frames skip
+  
+  # Frames for a vision model: WebP, at most 1024px
+  python scene_detector.py video.mp4 --extract-frames --image-format webp --quality 80 --max-size 1024
+  
+  # Thumbnails, model input and archive copies from a single decode
+  python scene_detector.py video.mp4 --extract-frames --frame-sizes 256,1024,full
+  
   # Extract clips and frames
   python scene_detector.py video.mp4 --extract-frames --extract-clips
   
+  # Frame-accurate clips, re-encoding only the partial GOPs at clip edges
+  python scene_detector.py video.mp4 --extract-clips --clip-mode smart
+  
+  # Scene playlists (HLS byte ranges) instead of clip files, the report plays
+  # them with the hls.js build at vendor/hls.min.js (or $HLS_JS) copied next to it
+  HLS_JS=~/hls.min.js python scene_detector.py video.mp4 --extract-clips --clip-mode hls --html
+  
   # Split into equal parts instead of detection
   python scene_detector.py video.mp4 --split-equal 20
         """
@@ -388,7 +3885,20 @@ Usage examples:
     
     parser.add_argument(
         "video",
-        help="Path to video file"
+        nargs="?",
+        help="Path to video file or m3u8 playlist (URL or file)"
+    )
+    
+    parser.add_argument(
+        "--version",
+        action="version",
+        version=f"%(prog)s {__version__}"
+    )
+    
+    parser.add_argument(
+        "--check",
+        action="store_true",
+        help="Check dependencies without importing them and exit"
     )
     
     parser.add_argument(
@@ -412,16 +3922,171 @@ Usage examples:
     
     parser.add_argument(
         "--detector",
-        choices=['content', 'adaptive'],
+        choices=['content', 'adaptive', 'numpy', 'ffmpeg-scene', 'slides'],
         default='content',
-        help="Detector type (default: content)"
+        help="Detector type (default: content, 'numpy' - batched content detector, "
+             "'ffmpeg-scene' - ffmpeg scene score, 'slides' - slide changes in screencasts)"
+    )
+    
+    parser.add_argument(
+        "--roi",
+        type=_parse_rect,
+        metavar="X,Y,W,H",
+        help="Region analysed by the slides detector, in pixels (default: full frame)"
+    )
+    
+    parser.add_argument(
+        "--exclude",
+        type=_parse_rect,
+        action="append",
+        metavar="X,Y,W,H",
+        help="Region ignored by the slides detector, e.g. a webcam overlay (repeatable)"
+    )
+    
+    parser.add_argument(
+        "--hysteresis",
+        type=int,
+        default=3,
+        metavar="K",
+        help="Analysed frames a slide change must persist before a cut (default: 3)"
+    )
+    
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        metavar="N",
+        help="Number of parallel detection processes (default: 1)"
+    )
+    
+    parser.add_argument(
+        "--profile",
+        choices=list(DETECTION_PROFILES),
+        default='full',
+        help="Detection profile: full or fast (downscaled, every 2nd frame) (default: full)"
+    )
+    
+    parser.add_argument(
+        "--downscale",
+        type=int,
+        metavar="N",
+        help="Downscale factor for detection, overrides profile (0 = auto)"
+    )
+    
+    parser.add_argument(
+        "--frame-stride",
+        type=int,
+        metavar="N",
+        help="Analyse every Nth frame, overrides profile"
+    )
+    
+    parser.add_argument(
+        "--backend",
+        choices=DECODE_BACKENDS,
+        default='opencv',
+        help="Frame decoding backend (default: opencv, 'ffmpeg-pipe' - scaled rawvideo from ffmpeg)"
+    )
+    
+    parser.add_argument(
+        "--luma-only",
+        action="store_true",
+        help="Compare only frame brightness (ffmpeg-pipe decodes gray frames for numpy detector)"
+    )
+    
+    parser.add_argument(
+        "--keyframes-only",
+        action="store_true",
+        help="Decode and compare only keyframes (fast triage, cuts land on keyframes)"
+    )
+    
+    parser.add_argument(
+        "--bisect",
+        action="store_true",
+        help="Compare keyframes (or sparse samples) and search only differing GOPs for the exact cut frame "
+             "(for mostly static videos)"
+    )
+    
+    parser.add_argument(
+        "--sample-interval",
+        type=float,
+        default=2.0,
+        metavar="SECONDS",
+        help="Seconds between samples in bisect mode when keyframes are too dense to sample (default: 2)"
+    )
+    
+    parser.add_argument(
+        "--two-pass",
+        action="store_true",
+        help="Coarse low-resolution pass over every Nth frame, then frame-accurate pass over candidate windows"
+    )
+    
+    parser.add_argument(
+        "--coarse-stride",
+        type=int,
+        default=10,
+        metavar="N",
+        help="Analyse every Nth frame in the coarse pass (default: 10)"
+    )
+    
+    parser.add_argument(
+        "--coarse-width",
+        type=int,
+        default=64,
+        metavar="PX",
+        help="Frame width for the coarse pass (default: 64)"
+    )
+    
+    parser.add_argument(
+        "--audio-guided",
+        action="store_true",
+        help="Decode video only around pauses in the audio track (lectures)"
+    )
+    
+    parser.add_argument(
+        "--pause-db",
+        type=float,
+        default=-30.0,
+        help="Audio level counted as a pause, in dB below speech (default: -30)"
+    )
+    
+    parser.add_argument(
+        "--pause-margin",
+        type=float,
+        default=0.5,
+        metavar="SECONDS",
+        help="Video examined before and after each pause (default: 0.5)"
+    )
+    
+    parser.add_argument(
+        "--audio-recall",
+        action="store_true",
+        help="Report recall of audio-guided cuts against a full run (uses the stats cache if present)"
+    )
+    
+    parser.add_argument(
+        "--benchmark",
+        action="store_true",
+        help="Report decode and detection FPS for every profile and exit"
+    )
+    
+    parser.add_argument(
+        "--sweep",
+        metavar="T1,T2,...",
+        help="Print scene counts for several thresholds (e.g. 3,5,10,20) using cached frame stats"
+    )
+    
+    parser.add_argument(
+        "--no-stats-cache",
+        dest="stats_cache",
+        action="store_false",
+        help="Don't save or reuse per-frame stats (scenes_stats.csv)"
     )
     
     parser.add_argument(
         "--split-equal",
         type=int,
         metavar="N",
-        help="Split into N equal parts instead of scene detection"
+        help="Split into N equal parts at keyframes instead of scene detection (no decoding)"
     )
     
     parser.add_argument(
@@ -437,12 +4102,95 @@ Usage examples:
         help="Frame type to extract (default: middle)"
     )
     
+    parser.add_argument(
+        "--extraction-mode",
+        choices=['seek', 'sequential'],
+        default='seek',
+        help="Frame extraction mode: seek per scene or single sequential pass (default: seek)"
+    )
+    
+    parser.add_argument(
+        "--dedup-frames",
+        choices=FRAME_DEDUP_MODES,
+        help="Find near duplicate frames by perceptual hash: mark them in metadata "
+             "or skip writing them (metadata points to the canonical frame)"
+    )
+    
+    parser.add_argument(
+        "--dedup-distance",
+        type=int,
+        default=FRAME_DEDUP_DISTANCE,
+        metavar="BITS",
+        help=f"Largest Hamming distance between 64-bit frame hashes of duplicates (default: {FRAME_DEDUP_DISTANCE})"
+    )
+    
+    parser.add_argument(
+        "--image-format",
+        choices=list(FRAME_FORMATS),
+        default='jpg',
+        help="Image format of extracted frames (default: jpg)"
+    )
+    
+    parser.add_argument(
+        "--quality",
+        type=int,
+        metavar="Q",
+        help="JPEG/WebP quality 1-100 (default: 95 for JPEG, 90 for WebP)"
+    )
+    
+    parser.add_argument(
+        "--max-size",
+        type=int,
+        default=0,
+        metavar="PX",
+        help="Downscale frames so the longest side is at most PX pixels (default: full size)"
+    )
+    
+    parser.add_argument(
+        "--frame-sizes",
+        type=_parse_sizes,
+        metavar="S1,S2,...",
+        help="Save every frame in several sizes (longest side in pixels or 'full') "
+             "into frames/<size>/, from one decode; replaces --max-size"
+    )
+    
+    parser.add_argument(
+        "--encode-workers",
+        type=int,
+        default=FRAME_WRITER_WORKERS,
+        metavar="N",
+        help=f"Threads encoding and writing frames, 0 = in the extraction loop (default: {FRAME_WRITER_WORKERS})"
+    )
+    
+    parser.add_argument(
+        "--remux",
+        metavar="PATH",
+        help="For m3u8 input: also save the stream as MP4 while detecting (needed for frames and clips)"
+    )
+    
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Extract frames and clips of each scene while detection continues, "
+             "writing scenes_metadata.jsonl as scenes are found (content and adaptive detectors; "
+             "not with --jobs, --backend ffmpeg-pipe, --keyframes-only, --bisect, --two-pass or --audio-guided)"
+    )
+    
     parser.add_argument(
         "--extract-clips",
         action="store_true",
         help="Extract video clips for each scene"
     )
     
+    parser.add_argument(
+        "--clip-mode",
+        choices=CLIP_MODES,
+        default='copy',
+        help="Clip cutting: copy (fast, starts at keyframes), smart (frame-accurate, "
+             "re-encodes only clip edges), reencode (frame-accurate, slow), "
+             "hls (per-scene playlists into one fMP4 copy, no clip files)"
+    )
+    
     parser.add_argument(
         "--html",
         action="store_true",
@@ -456,6 +4204,18 @@ Usage examples:
     
     args = parser.parse_args()
     
+    if args.check:
+        sys.exit(0 if check_dependencies() else 1)
+    
+    if not args.video:
+        parser.error("the following arguments are required: video")
+    
+    if args.stream and not args.split_equal:
+        conflicts = _stream_conflicts(args.jobs, args.backend, args.keyframes_only,
+                                      args.bisect, args.two_pass, args.audio_guided)
+        if conflicts:
+            parser.error(f"--stream can't be combined with {', '.join(conflicts)}")
+    
     try:
         # Process transcript parameter
         transcript = args.transcript
@@ -467,34 +4227,157 @@ Usage examples:
         # Create extractor
         extractor = SceneExtractor(args.video, args.output, transcript)
         
-        if args.split_equal:
-            # Split into equal parts
-            print(f"🔪 Splitting video into {args.split_equal} equal parts...")
-            # This would need to be implemented
-            print("❌ Equal splitting not implemented yet")
+        if args.benchmark:
+            extractor.benchmark_profiles(args.threshold, args.min_scene_len, args.detector)
             return
         
-        # Detect scenes
-        scenes = extractor.detect_scenes(
-            threshold=args.threshold,
-            min_scene_len=args.min_scene_len,
-            detector_type=args.detector
-        )
+        if args.sweep:
+            thresholds = [float(value) for value in args.sweep.split(',') if value.strip()]
+            extractor.sweep_thresholds(thresholds, args.min_scene_len, args.detector)
+            return
+        
+        if extractor.source:
+            # Scene detection while the stream downloads
+            if args.benchmark or args.sweep or args.split_equal:
+                print("❌ --benchmark, --sweep and --split-equal need a video file, not a stream")
+                sys.exit(1)
+            
+            # Streams are decoded once at full rate through the ffmpeg tee
+            conflicts = _stream_conflicts(args.jobs, args.backend, args.keyframes_only,
+                                          args.bisect, args.two_pass, args.audio_guided)
+            if conflicts:
+                print(f"⚠️  {', '.join(conflicts)} not supported for streams, ignored")
+            
+            scenes = extractor.detect_scenes_stream(
+                threshold=args.threshold,
+                min_scene_len=args.min_scene_len,
+                detector_type=args.detector,
+                profile=args.profile,
+                downscale=args.downscale,
+                frame_stride=args.frame_stride,
+                luma_only=args.luma_only,
+                remux_path=args.remux,
+                score_frames=args.extract_frames and args.frame_type == 'best'
+            )
+            
+            if not scenes:
+                print("❌ No scenes detected")
+                return
+            
+            if args.extract_frames or args.extract_clips:
+                if extractor.video_path.exists():
+                    if args.extract_frames:
+                        extractor.extract_frames(args.frame_type, args.extraction_mode,
+                                                 args.dedup_frames, args.dedup_distance,
+                                                 args.image_format, args.quality, args.max_size,
+                                                 args.encode_workers, args.frame_sizes)
+                    if args.extract_clips:
+                        extractor.extract_clips(mode=args.clip_mode)
+                else:
+                    print("⚠️  Frames and clips need the MP4 copy of the stream (--remux)")
+            
+            extractor.save_metadata()
+            
+            if args.html:
+                extractor.generate_html_report()
+            
+            print(f"\n✨ Done! Results saved in: {extractor.output_dir}")
+            return
+        
+        if args.stream and not args.split_equal:
+            # Extract every scene as soon as detection confirms it
+            start_time = time.time()
+            for number, start, end in extractor.iter_scenes(
+                threshold=args.threshold,
+                min_scene_len=args.min_scene_len,
+                detector_type=args.detector,
+                profile=args.profile,
+                downscale=args.downscale,
+                frame_stride=args.frame_stride,
+                luma_only=args.luma_only,
+                score_frames=args.extract_frames and args.frame_type == 'best',
+                use_stats_cache=args.stats_cache,
+                roi=args.roi,
+                exclude=args.exclude,
+                hysteresis=args.hysteresis
+            ):
+                print(f"   Scene {number:03d}: {extractor._format_time(start.get_seconds())} - "
+                      f"{extractor._format_time(end.get_seconds())} (duration: {end.get_seconds() - start.get_seconds():.2f}s)")
+                if args.extract_frames or args.extract_clips:
+                    extractor.extract_scene(
+                        number, start, end,
+                        args.frame_type if args.extract_frames else None,
+                        args.extract_clips,
+                        args.clip_mode,
+                        args.dedup_frames,
+                        args.dedup_distance,
+                        args.image_format,
+                        args.quality,
+                        args.max_size,
+                        args.frame_sizes
+                    )
+            
+            if not extractor.scene_list:
+                print("❌ No scenes detected")
+                return
+            
+            print(f"\n✅ Found scenes: {len(extractor.scene_list)} ({time.time() - start_time:.1f}s)")
+            extractor.save_metadata()
+            
+            if args.html:
+                extractor.generate_html_report()
+            
+            print(f"\n✨ Done! Results saved in: {extractor.output_dir}")
+            return
+        
+        if args.split_equal:
+            # Equal parts from the container duration, nothing is decoded
+            scenes = extractor.split_equal(args.split_equal)
+        else:
+            # Detect scenes
+            scenes = extractor.detect_scenes(
+                threshold=args.threshold,
+                min_scene_len=args.min_scene_len,
+                detector_type=args.detector,
+                jobs=args.jobs,
+                use_stats_cache=args.stats_cache,
+                profile=args.profile,
+                downscale=args.downscale,
+                frame_stride=args.frame_stride,
+                backend=args.backend,
+                luma_only=args.luma_only,
+                keyframes_only=args.keyframes_only,
+                bisect=args.bisect,
+                sample_interval=args.sample_interval,
+                two_pass=args.two_pass,
+                coarse_stride=args.coarse_stride,
+                coarse_width=args.coarse_width,
+                roi=args.roi,
+                exclude=args.exclude,
+                hysteresis=args.hysteresis,
+                audio_guided=args.audio_guided,
+                pause_db=args.pause_db,
+                pause_margin=args.pause_margin,
+                audio_recall=args.audio_recall,
+                score_frames=args.extract_frames and args.frame_type == 'best'
+            )
         
         if not scenes:
             print("❌ No scenes detected")
             return
         
-        # Save metadata
-        extractor.save_metadata()
-        
         # Extract frames if requested
         if args.extract_frames:
-            extractor.extract_frames(args.frame_type)
+            extractor.extract_frames(args.frame_type, args.extraction_mode, args.dedup_frames, args.dedup_distance,
+                                     args.image_format, args.quality, args.max_size, args.encode_workers,
+                                     args.frame_sizes)
+        
+        # Save metadata (with the extracted frame of every scene)
+        extractor.save_metadata()
         
         # Extract clips if requested
         if args.extract_clips:
-            extractor.extract_clips()
+            extractor.extract_clips(mode=args.clip_mode)
         
         # Generate HTML report if requested
         if args.html:
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Test script for 'best' frame selection of the scene detector
+"""
+
+import numpy as np
+
+from scene_detector import FrameQualityTracker
+
+
+def test_uniform_scene_skips_transition():
+    """A flat scene has no sharpness, so the stillest frame must win, not the transition frame"""
+
+    print("🧪 Testing best frame of a uniform scene...")
+
+    tracker = FrameQualityTracker(bucket=10)
+
+    # Previous scene: black frames
+    for frame_num in range(10):
+        tracker.process_frame(frame_num, np.zeros((36, 64), dtype=np.uint8))
+
+    # Uniform grey scene fading in over its first frames, then still
+    levels = [60, 120, 180, 200, 200, 200, 200, 200, 200, 200]
+    for offset, level in enumerate(levels):
+        tracker.process_frame(10 + offset, np.full((36, 64), level, dtype=np.uint8))
+
+    best = tracker.best(10, 20)
+    print(f"📊 Best frame: {best}")
+
+    assert best is not None
+    assert best["sharpness"] == 0
+    assert best["motion"] == 0
+    assert best["frame"] >= 14, "transition frame picked on a flat scene"
+
+    print("✅ Stable frame picked")
+
+
+def test_sharp_frame_wins():
+    """A sharp, still frame must beat flat frames of the same scene"""
+
+    print("🧪 Testing best frame of a textured scene...")
+
+    tracker = FrameQualityTracker(bucket=4)
+    flat = np.full((36, 64), 128, dtype=np.uint8)
+    textured = np.tile(np.array([0, 255], dtype=np.uint8), (36, 32))
+
+    for frame_num, frame in enumerate([flat, flat, textured, textured, flat, flat]):
+        tracker.process_frame(frame_num, frame)
+
+    best = tracker.best(0, 6)
+    print(f"📊 Best frame: {best}")
+
+    assert best["frame"] == 3, "expected the still textured frame"
+
+    print("✅ Sharp frame picked")
+
+
+def main():
+    """Run all tests"""
+    test_uniform_scene_skips_transition()
+    test_sharp_frame_wins()
+    print("\n🎉 All tests passed!")
+
+
+if __name__ == "__main__":
+    main()
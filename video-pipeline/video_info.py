@@ -0,0 +1,419 @@
+#!/usr/bin/env python3
+"""
+Video probe shared by the pipeline stages
+Reads fps, frame count, duration, codec, resolution and keyframe interval
+with one ffprobe call (OpenCV as fallback) and caches them on disk.
+Builds keyframe indexes used for seeking and copy-safe cut points.
+"""
+
+import os
+import sys
+import json
+import shutil
+import subprocess
+import statistics
+from pathlib import Path
+from typing import Optional, Dict, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import numpy as np
+
+
+# Cache file, shared by all runs of the pipeline and scene detector
+CACHE_FILE = Path(os.environ.get('XDG_CACHE_HOME', Path.home() / '.cache')) / 'video-pipeline' / 'video_info.json'
+
+# Seconds from the start of the video scanned for the keyframe interval
+KEYFRAME_SCAN_SECONDS = 120
+
+
+class VideoInfo:
+    """Basic properties of a video file"""
+    
+    def __init__(self,
+                 fps: float,
+                 frame_count: int,
+                 duration: float,
+                 codec: str = '',
+                 width: int = 0,
+                 height: int = 0,
+                 keyframe_interval: Optional[float] = None):
+        """
+        :param fps: Frames per second
+        :param frame_count: Number of frames
+        :param duration: Duration in seconds
+        :param codec: Video codec name
+        :param width: Frame width in pixels
+        :param height: Frame height in pixels
+        :param keyframe_interval: Typical distance between keyframes in frames (None if unknown)
+        """
+        self.fps = fps
+        self.frame_count = frame_count
+        self.duration = duration
+        self.codec = codec
+        self.width = width
+        self.height = height
+        self.keyframe_interval = keyframe_interval
+    
+    @property
+    def resolution(self) -> str:
+        """Resolution as WIDTHxHEIGHT"""
+        return f"{self.width}x{self.height}"
+    
+    def to_dict(self) -> Dict:
+        """Convert to dictionary for the cache file"""
+        return {
+            "fps": self.fps,
+            "frame_count": self.frame_count,
+            "duration": self.duration,
+            "codec": self.codec,
+            "width": self.width,
+            "height": self.height,
+            "keyframe_interval": self.keyframe_interval
+        }
+    
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'VideoInfo':
+        """Create from a cache file entry"""
+        return cls(**data)
+    
+    def __repr__(self) -> str:
+        return (f"VideoInfo({self.resolution}, {self.codec}, {self.fps:.2f} fps, "
+                f"{self.frame_count} frames, {self.duration:.2f}s, keyframe interval: {self.keyframe_interval})")
+
+
+# Cache entries loaded in this process
+_memory_cache = {}
+
+
+def probe_video(video_path: str, use_cache: bool = True) -> VideoInfo:
+    """
+    Probe video properties, reusing the disk cache when the file is unchanged
+    
+    Cache entries are keyed by absolute path and are valid while the file
+    size and modification time match.
+    
+    :param video_path: Path to video file
+    :param use_cache: Read and update the cache file
+    :return: Video properties
+    """
+    path = Path(video_path).resolve()
+    stat = path.stat()
+    key = str(path)
+    
+    if use_cache:
+        entry = _load_cache().get(key)
+        if entry and entry.get("size") == stat.st_size and entry.get("mtime") == stat.st_mtime:
+            return VideoInfo.from_dict(entry["info"])
+    
+    info = _probe_ffprobe(path) if shutil.which("ffprobe") else None
+    if info is None:
+        info = _probe_opencv(path)
+    
+    if use_cache:
+        # Other runs may have added entries since the cache was loaded
+        cache = _load_cache(reload=True)
+        cache[key] = {"size": stat.st_size, "mtime": stat.st_mtime, "info": info.to_dict()}
+        _save_cache(cache)
+    
+    return info
+
+
+def _probe_ffprobe(path: Path) -> Optional[VideoInfo]:
+    """
+    Probe with a single ffprobe call
+    
+    Stream properties come from the container header; keyframe flags of
+    packets from the first KEYFRAME_SCAN_SECONDS give the keyframe interval
+    without decoding.
+    
+    :param path: Path to video file
+    :return: Video properties or None if ffprobe fails
+    """
+    cmd = [
+        "ffprobe", "-v", "error",
+        "-select_streams", "v:0",
+        "-read_intervals", f"%+{KEYFRAME_SCAN_SECONDS}",
+        "-show_entries", "stream=codec_name,width,height,r_frame_rate,avg_frame_rate,nb_frames,duration"
+                         ":format=duration:packet=pts_time,flags",
+        "-of", "json",
+        str(path)
+    ]
+    
+    try:
+        result = subprocess.run(cmd, capture_output=True, text=True, timeout=120)
+        data = json.loads(result.stdout) if result.returncode == 0 else {}
+    except (subprocess.TimeoutExpired, json.JSONDecodeError):
+        return None
+    
+    if not data.get("streams"):
+        return None
+    
+    stream = data["streams"][0]
+    
+    # OpenCV reports r_frame_rate as FPS, keep frame numbers consistent with it
+    fps = _parse_rate(stream.get("r_frame_rate")) or _parse_rate(stream.get("avg_frame_rate"))
+    if not fps:
+        return None
+    
+    duration = float(stream.get("duration") or data.get("format", {}).get("duration") or 0)
+    frame_count = int(stream.get("nb_frames") or 0) or round(duration * fps)
+    
+    keyframe_times = [
+        float(packet["pts_time"]) for packet in data.get("packets", [])
+        if 'K' in packet.get("flags", "") and packet.get("pts_time") not in (None, "N/A")
+    ]
+    keyframe_times.sort()
+    gaps = [(b - a) * fps for a, b in zip(keyframe_times, keyframe_times[1:])]
+    
+    return VideoInfo(
+        fps=fps,
+        frame_count=frame_count,
+        duration=duration,
+        codec=stream.get("codec_name", ""),
+        width=int(stream.get("width") or 0),
+        height=int(stream.get("height") or 0),
+        keyframe_interval=round(statistics.median(gaps), 2) if gaps else None
+    )
+
+
+def _probe_opencv(path: Path) -> VideoInfo:
+    """
+    Probe with OpenCV when ffprobe is not available (no keyframe interval)
+    
+    :param path: Path to video file
+    :return: Video properties
+    """
+    import cv2
+    
+    cap = cv2.VideoCapture(str(path))
+    if not cap.isOpened():
+        raise RuntimeError(f"Can't open video: {path}")
+    
+    fps = cap.get(cv2.CAP_PROP_FPS)
+    frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+    fourcc = int(cap.get(cv2.CAP_PROP_FOURCC))
+    info = VideoInfo(
+        fps=fps,
+        frame_count=frame_count,
+        duration=frame_count / fps if fps > 0 else 0,
+        codec="".join(chr((fourcc >> 8 * i) & 0xFF) for i in range(4)).strip('\x00 ').lower(),
+        width=int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)),
+        height=int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+    )
+    cap.release()
+    return info
+
+
+class KeyframeIndex:
+    """
+    Keyframes of a video: presentation time, byte offset and frame number
+    
+    Frame numbers count frames in presentation order from 0, the same way
+    OpenCV and PySceneDetect number them.
+    """
+    
+    def __init__(self, pts: 'np.ndarray', pos: 'np.ndarray', frames: 'np.ndarray', start_time: float = 0.0):
+        """
+        :param pts: Keyframe presentation times in seconds (sorted)
+        :param pos: Keyframe byte offsets in the file (-1 if unknown)
+        :param frames: Keyframe frame numbers
+        :param start_time: Container start time, seek offsets are relative to it
+        """
+        self.pts = pts
+        self.pos = pos
+        self.frames = frames
+        self.start_time = start_time
+    
+    def __len__(self) -> int:
+        return len(self.frames)
+    
+    def preceding(self, frame_number: int) -> int:
+        """
+        Position of the last keyframe at or before a frame
+        
+        :param frame_number: Frame number
+        :return: Index into the keyframe arrays
+        """
+        return max(0, int(self.frames.searchsorted(frame_number, side='right')) - 1)
+    
+    def preceding_frame(self, frame_number: int) -> int:
+        """Frame number of the last keyframe at or before a frame"""
+        return int(self.frames[self.preceding(frame_number)])
+    
+    def time_of(self, frame_number: int) -> float:
+        """Seek offset of the last keyframe at or before a frame"""
+        return max(0.0, float(self.pts[self.preceding(frame_number)] - self.start_time))
+    
+    def preceding_time(self, seconds: float) -> float:
+        """
+        Seek offset of the last keyframe at or before a time
+        
+        :param seconds: Time from the start of the video
+        :return: Keyframe time from the start of the video
+        """
+        offsets = self.pts - self.start_time
+        # Tolerate float noise between frame based and pts based times
+        k = max(0, int(offsets.searchsorted(seconds + 1e-3, side='right')) - 1)
+        return max(0.0, float(offsets[k]))
+    
+    def save(self, path: Path, size: int, mtime: float):
+        """
+        Save as NumPy archive
+        
+        :param path: Sidecar file path (.npz)
+        :param size: Video file size, to detect a changed video
+        :param mtime: Video modification time
+        """
+        import numpy as np
+        
+        with open(path, 'wb') as f:
+            np.savez(f, pts=self.pts, pos=self.pos, frames=self.frames,
+                     meta=np.array([size, mtime, self.start_time], dtype=np.float64))
+    
+    @classmethod
+    def load(cls, path: Path, size: int, mtime: float) -> Optional['KeyframeIndex']:
+        """
+        Load NumPy archive if it belongs to the video
+        
+        :param path: Sidecar file path (.npz)
+        :param size: Current video file size
+        :param mtime: Current video modification time
+        :return: Keyframe index or None if missing or out of date
+        """
+        import numpy as np
+        
+        try:
+            with np.load(path) as data:
+                meta = data["meta"]
+                if meta[0] != size or meta[1] != mtime:
+                    return None
+                return cls(data["pts"], data["pos"], data["frames"], float(meta[2]))
+        except (OSError, KeyError, ValueError):
+            return None
+
+
+def load_keyframe_index(video_path: str, sidecar_path: Path) -> Optional[KeyframeIndex]:
+    """
+    Load keyframe index from its sidecar file, building it when needed
+    
+    :param video_path: Path to video file
+    :param sidecar_path: Sidecar file path (.npz)
+    :return: Keyframe index or None if it can't be built
+    """
+    path = Path(video_path)
+    if not path.is_file():
+        return None
+    stat = path.stat()
+    
+    if sidecar_path.exists():
+        index = KeyframeIndex.load(sidecar_path, stat.st_size, stat.st_mtime)
+        if index is not None:
+            return index
+    
+    index = build_keyframe_index(path)
+    if index is not None:
+        try:
+            index.save(sidecar_path, stat.st_size, stat.st_mtime)
+        except OSError as e:
+            print(f"⚠️  Failed to save keyframe index: {e}")
+    return index
+
+
+def build_keyframe_index(video_path: Path) -> Optional[KeyframeIndex]:
+    """
+    Build keyframe index from packet headers (demuxing only, nothing is decoded)
+    
+    :param video_path: Path to video file
+    :return: Keyframe index or None if ffprobe is missing or fails
+    """
+    if not shutil.which("ffprobe"):
+        return None
+    
+    import numpy as np
+    
+    cmd = [
+        "ffprobe", "-v", "error",
+        "-select_streams", "v:0",
+        "-show_entries", "packet=pts_time,pos,flags:format=start_time",
+        "-of", "json",
+        str(video_path)
+    ]
+    
+    try:
+        result = subprocess.run(cmd, capture_output=True, text=True, timeout=600)
+        data = json.loads(result.stdout) if result.returncode == 0 else {}
+    except (subprocess.TimeoutExpired, json.JSONDecodeError):
+        return None
+    
+    packets = [p for p in data.get("packets", []) if p.get("pts_time") not in (None, "N/A")]
+    if not packets:
+        return None
+    
+    pts = np.array([float(p["pts_time"]) for p in packets])
+    keyframe = np.array(['K' in p.get("flags", "") for p in packets])
+    pos = np.array([int(p.get("pos") or -1) for p in packets], dtype=np.int64)
+    
+    # Packets come in decode order, frame numbers follow presentation order
+    all_pts = np.sort(pts)
+    order = np.argsort(pts[keyframe], kind='stable')
+    keyframe_pts = pts[keyframe][order]
+    
+    return KeyframeIndex(
+        pts=keyframe_pts,
+        pos=pos[keyframe][order],
+        frames=all_pts.searchsorted(keyframe_pts).astype(np.int64),
+        start_time=float(data.get("format", {}).get("start_time") or 0)
+    )
+
+
+def _parse_rate(rate: Optional[str]) -> float:
+    """Parse ffprobe frame rate like '30000/1001'"""
+    if not rate:
+        return 0.0
+    numerator, _, denominator = rate.partition('/')
+    try:
+        return float(numerator) / float(denominator or 1)
+    except (ValueError, ZeroDivisionError):
+        return 0.0
+
+
+def _load_cache(reload: bool = False) -> Dict:
+    """
+    Load cache file (once per process unless reload is set)
+    
+    :param reload: Read the file again
+    :return: Cache entries by video path
+    """
+    if (reload or not _memory_cache) and CACHE_FILE.exists():
+        try:
+            with open(CACHE_FILE, 'r', encoding='utf-8') as f:
+                _memory_cache.update(json.load(f))
+        except (OSError, json.JSONDecodeError):
+            pass
+    return _memory_cache
+
+
+def _save_cache(cache: Dict):
+    """Write cache file atomically, so parallel runs never read a partial file"""
+    try:
+        CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        temp_file = CACHE_FILE.with_suffix(f".{os.getpid()}.tmp")
+        with open(temp_file, 'w', encoding='utf-8') as f:
+            json.dump(cache, f, indent=2)
+        os.replace(temp_file, CACHE_FILE)
+    except OSError as e:
+        print(f"⚠️  Failed to save video info cache: {e}")
+
+
+def main():
+    """Print video properties: python video_info.py video.mp4 [...]"""
+    if len(sys.argv) < 2:
+        print("Usage: python video_info.py VIDEO [VIDEO ...]")
+        sys.exit(1)
+    
+    for video_path in sys.argv[1:]:
+        print(f"{video_path}: {probe_video(video_path)}")
+
+
+if __name__ == "__main__":
+    main()